@@ -2,19 +2,38 @@
 Dataset API routes
 """
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-import json
+from typing import Any, AsyncIterator, Dict, List, Tuple, Union
+import codecs
 import csv
 import io
+import mmap
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, JSON uploads are then parsed in one pass
+    ijson = None
 
 from ...db.session import get_db
 from ...schemas.dataset import DatasetCreate, DatasetResponse, DatasetWithItems, DatasetItemCreate
 from ...services import dataset_service
+from ...core.config import settings
 from ...core.logging import log
+from ...core.serialization import json_loads
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
 
+# Uploads are read in chunks of this size instead of all at once
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Uploads larger than this are parsed from a memory map of the spooled file
+MMAP_THRESHOLD = 10 * 1024 * 1024
+
+# Validators are compiled once and reused for every upload
+_ITEM_ADAPTER = TypeAdapter(DatasetItemCreate)
+_ITEM_LIST_ADAPTER = TypeAdapter(List[DatasetItemCreate])
+
 
 @router.post("", response_model=DatasetResponse, status_code=201)
 async def create_dataset(
@@ -45,34 +64,36 @@ async def upload_dataset(
     - JSON: {"items": [{query, ground_truth_docs, ground_truth_answer}, ...]}
     - JSONL: one item per line
     """
+    # Backstop only: the body has already been spooled to disk at this point.
+    # limit_request_size (main.py) rejects oversized bodies before reading,
+    # but chunked uploads carry no Content-Length and get past it
+    if file.size is not None and file.size > settings.MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Uploaded file too large")
+    
     try:
-        content = await file.read()
-        content_str = content.decode('utf-8')
-        
         # Determine format from filename
         filename = file.filename.lower()
         
         if filename.endswith('.json'):
-            items = _parse_json(content_str)
+            items = _parse_json_stream(file)
             file_format = "json"
         elif filename.endswith('.jsonl'):
-            items = _parse_jsonl(content_str)
+            items = _parse_jsonl_stream(file)
             file_format = "jsonl"
         elif filename.endswith('.csv'):
-            items = _parse_csv(content_str)
+            items = _parse_csv_stream(file)
             file_format = "csv"
         else:
             raise ValueError("Unsupported file format. Use .json, .jsonl, or .csv")
         
-        # Create dataset
-        dataset_data = DatasetCreate(
+        # Items are parsed lazily while the dataset is being written
+        created = await dataset_service.create_dataset_from_stream(
+            db,
             name=name or file.filename,
             description=description,
-            items=items,
-            file_format=file_format
+            file_format=file_format,
+            items=items
         )
-        
-        created = await dataset_service.create_dataset(db, dataset_data)
         return created
         
     except Exception as e:
@@ -115,9 +136,9 @@ async def delete_dataset(
     return None
 
 
-def _parse_json(content: str) -> List[DatasetItemCreate]:
+def _parse_json(content: Union[bytes, memoryview]) -> List[DatasetItemCreate]:
     """Parse JSON format"""
-    data = json.loads(content)
+    data = json_loads(content)
     
     if isinstance(data, dict) and "items" in data:
         items = data["items"]
@@ -126,39 +147,151 @@ def _parse_json(content: str) -> List[DatasetItemCreate]:
     else:
         raise ValueError("Invalid JSON format")
     
-    return [DatasetItemCreate(**item) for item in items]
+    return _ITEM_LIST_ADAPTER.validate_python(items)
+
+
+async def _parse_json_file(file: UploadFile) -> List[DatasetItemCreate]:
+    """Parse a whole JSON upload, memory-mapping large files instead of reading them"""
+    if file.size is None or file.size <= MMAP_THRESHOLD:
+        return _parse_json(await file.read())
+    
+    # Large uploads have already been spooled to disk, so fileno() does not copy
+    with mmap.mmap(file.file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            return _parse_json(view)
+
+
+async def _parse_json_stream(file: UploadFile) -> AsyncIterator[DatasetItemCreate]:
+    """Parse JSON format incrementally (falls back to a full read without ijson)"""
+    if ijson is None:
+        for item in await _parse_json_file(file):
+            yield item
+        return
+    
+    # Peek at the first character to tell a bare array from an {"items": [...]} object
+    head = (await file.read(UPLOAD_CHUNK_SIZE)).lstrip()
+    await file.seek(0)
+    
+    if head.startswith(b'['):
+        array_path = ''
+    elif head.startswith(b'{'):
+        array_path = 'items'
+    else:
+        raise ValueError("Invalid JSON format")
+    
+    async for item in _json_array_items(file, array_path):
+        yield _ITEM_ADAPTER.validate_python(item)
+
+
+async def _json_array_items(file: UploadFile, array_path: str) -> AsyncIterator[Any]:
+    """
+    Yield the elements of the array at array_path as they are parsed.
+    
+    Raises:
+        ValueError: If the document has no array at array_path (like
+            _parse_json, e.g. for {"data": [...]} or {"items": 5})
+    """
+    item_path = f'{array_path}.item' if array_path else 'item'
+    found = False
+    builder = None
+    end_event = None
+    
+    async for path, event, value in ijson.parse_async(file, use_float=True):
+        if builder is not None:
+            # Inside a container element, build it until its closing event
+            builder.event(event, value)
+            if path == item_path and event == end_event:
+                yield builder.value
+                builder = None
+        elif path == item_path:
+            if event in ('start_map', 'start_array'):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                end_event = event.replace('start', 'end')
+            else:
+                yield value
+        elif path == array_path and event == 'start_array':
+            found = True
+    
+    if not found:
+        raise ValueError("Invalid JSON format")
 
 
-def _parse_jsonl(content: str) -> List[DatasetItemCreate]:
-    """Parse JSONL format"""
-    items = []
-    for line in content.strip().split('\n'):
-        if line.strip():
-            item = json.loads(line)
-            items.append(DatasetItemCreate(**item))
-    return items
+async def _parse_jsonl_stream(file: UploadFile) -> AsyncIterator[DatasetItemCreate]:
+    """Parse JSONL format one line at a time"""
+    buffer = b''
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        
+        buffer += chunk
+        lines = buffer.splitlines()
+        # Keep the trailing partial line for the next chunk
+        buffer = lines.pop() if lines and not buffer.endswith((b'\n', b'\r')) else b''
+        
+        for line in lines:
+            if line and not line.isspace():
+                yield _ITEM_ADAPTER.validate_json(line)
+    
+    if buffer and not buffer.isspace():
+        yield _ITEM_ADAPTER.validate_json(buffer)
 
 
-def _parse_csv(content: str) -> List[DatasetItemCreate]:
-    """Parse CSV format"""
-    items = []
-    reader = csv.DictReader(io.StringIO(content))
+async def _parse_csv_stream(file: UploadFile) -> AsyncIterator[DatasetItemCreate]:
+    """Parse CSV format row by row as chunks are read"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    fieldnames = None
+    pending = ''
     
-    for row in reader:
-        # Parse ground_truth_docs (could be JSON array or comma-separated)
-        gt_docs_str = row.get('ground_truth_docs', '[]')
-        try:
-            gt_docs = json.loads(gt_docs_str)
-        except:
-            # Fallback: split by comma
-            gt_docs = [d.strip() for d in gt_docs_str.split(',') if d.strip()]
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        pending += decoder.decode(chunk, final=not chunk)
         
-        item = DatasetItemCreate(
-            query=row['query'],
-            ground_truth_docs=gt_docs if gt_docs else None,
-            ground_truth_answer=row.get('ground_truth_answer')
-        )
-        items.append(item)
+        # Only parse whole rows, a quoted field may span lines and chunks
+        rows, pending = _split_complete_rows(pending, final=not chunk)
+        if rows:
+            reader = csv.DictReader(io.StringIO(rows, newline=''), fieldnames=fieldnames)
+            for row in reader:
+                yield _parse_csv_row(row)
+            fieldnames = reader.fieldnames
+        
+        if not chunk:
+            break
+
+
+def _split_complete_rows(text: str, final: bool) -> Tuple[str, str]:
+    """Split CSV text into its complete rows and the trailing partial row"""
+    if final:
+        return text, ''
     
-    return items
+    # A newline ends a row unless it is inside a quoted field, i.e. after an
+    # odd number of quotes (escaped quotes are doubled, so parity holds)
+    in_quotes = False
+    end = 0
+    position = 0
+    for line in text.split('\n')[:-1]:
+        position += len(line) + 1
+        if line.count('"') % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            end = position
+    
+    return text[:end], text[end:]
+
 
+def _parse_csv_row(row: Dict[str, str]) -> DatasetItemCreate:
+    """Build a dataset item from a CSV row"""
+    # Parse ground_truth_docs (could be JSON array or comma-separated)
+    gt_docs_str = row.get('ground_truth_docs', '[]')
+    try:
+        gt_docs = json_loads(gt_docs_str)
+    except (ValueError, TypeError):
+        # Fallback: split by comma
+        gt_docs = [d.strip() for d in gt_docs_str.split(',') if d.strip()]
+    
+    return DatasetItemCreate(
+        query=row['query'],
+        ground_truth_docs=gt_docs if gt_docs else None,
+        ground_truth_answer=row.get('ground_truth_answer')
+    )
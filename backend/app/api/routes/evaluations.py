@@ -1,13 +1,15 @@
 """
 Evaluation API routes
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from ...db.session import get_db
 from ...schemas.evaluation import EvaluationRunCreate, EvaluationRunResponse, EvaluationResultResponse, RunComparison
-from ...services import evaluation_service
+from ...services import evaluation_service, evaluation_worker
 from ...core.logging import log
 
 router = APIRouter(prefix="/evaluations", tags=["evaluations"])
@@ -16,30 +18,36 @@ router = APIRouter(prefix="/evaluations", tags=["evaluations"])
 @router.post("", response_model=EvaluationRunResponse, status_code=201)
 async def create_evaluation_run(
     run_data: EvaluationRunCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Create and start an evaluation run.
-    The evaluation runs in the background.
+    The evaluation is queued and executed by the background worker pool.
     """
+    if evaluation_worker.is_full():
+        raise HTTPException(status_code=503, detail="Evaluation queue is full, try again later")
+    
     try:
         # Create run
         run = await evaluation_service.create_evaluation_run(db, run_data)
-        
-        # Execute in background
-        background_tasks.add_task(
-            _execute_run_background,
-            run.id
-        )
-        
-        return run
-        
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         log.error(f"Error creating evaluation run: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    try:
+        evaluation_worker.enqueue_run(run.id)
+    except asyncio.QueueFull:
+        # The queue filled up while the run was being created
+        await evaluation_service.mark_run_failed(db, run, "Evaluation queue is full")
+        raise HTTPException(status_code=503, detail="Evaluation queue is full, try again later")
+    except RuntimeError as e:
+        # The worker pool isn't running (e.g. during shutdown)
+        await evaluation_service.mark_run_failed(db, run, str(e))
+        raise HTTPException(status_code=503, detail="Evaluation workers are not available, try again later")
+    
+    return run
 
 
 @router.get("", response_model=List[EvaluationRunResponse])
@@ -60,7 +68,7 @@ async def get_evaluation_run(
     db: AsyncSession = Depends(get_db)
 ):
     """Get an evaluation run"""
-    run = await evaluation_service.get_evaluation_run(db, run_id)
+    run = await evaluation_service.get_evaluation_run_response(db, run_id)
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     return run
@@ -94,14 +102,3 @@ async def compare_runs(
         log.error(f"Error comparing runs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-
-async def _execute_run_background(run_id: str):
-    """Execute evaluation run in background"""
-    from ...db.session import AsyncSessionLocal
-    
-    async with AsyncSessionLocal() as db:
-        try:
-            await evaluation_service.execute_evaluation_run(db, run_id)
-        except Exception as e:
-            log.error(f"Background execution failed for run {run_id}: {e}")
-
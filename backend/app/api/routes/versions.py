@@ -29,7 +29,7 @@ async def get_version(
     version_number: int,
     db: AsyncSession = Depends(get_db)
 ):
-    version = await version_service.get_version(db, dataset_id, version_number)
+    version = await version_service.get_version_response(db, dataset_id, version_number)
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
     return version
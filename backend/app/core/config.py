@@ -25,9 +25,27 @@ class Settings(BaseSettings):
     # Evaluation settings
     DEFAULT_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     SEMANTIC_SIMILARITY_THRESHOLD: float = 0.7
+    EMBEDDING_CACHE_SIZE: int = 10000
+    EMBEDDING_CACHE_HALF_PRECISION: bool = True
     
-    # Batch processing
-    MAX_BATCH_SIZE: int = 100
+    # Batch processing (dataset items per bulk insert; PostgreSQL switches to
+    # COPY from db.bulk.COPY_THRESHOLD rows)
+    MAX_BATCH_SIZE: int = 1000
+    RESULT_FLUSH_SIZE: int = 500
+    PROGRESS_COMMIT_INTERVAL: int = 50
+    
+    # Uploads
+    MAX_UPLOAD_BYTES: int = 200 * 1024 * 1024
+    
+    # RAG API responses cached across runs (0 disables; cached answers do not
+    # reflect changes to the RAG system behind an endpoint)
+    RAG_RESPONSE_CACHE_SIZE: int = 0
+    
+    # Evaluation workers
+    EVAL_WORKER_CONCURRENCY: int = 4
+    EVAL_QUEUE_SIZE: int = 100
+    # Items of one run evaluated concurrently (RAG requests in flight per run)
+    EVAL_ITEM_CONCURRENCY: int = 8
     
     class Config:
         env_file = ".env"
@@ -10,20 +10,31 @@ def setup_logging():
     """Configure application logging"""
     logger.remove()  # Remove default handler
     
-    logger.add(
-        sys.stderr,
-        level=settings.LOG_LEVEL,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        colorize=True,
-    )
-    
-    # Add file logging for production
     if settings.ENV == "production":
+        # Plain format without ANSI parsing, formatted on loguru's background thread
+        logger.add(
+            sys.stderr,
+            level=settings.LOG_LEVEL,
+            format="{time} {level} {message}",
+            colorize=False,
+            enqueue=True,
+        )
+        
+        # Line-delimited JSON records for the log files
         logger.add(
             "logs/evrag_{time}.log",
             rotation="500 MB",
             retention="10 days",
-            level="INFO",
+            level=settings.LOG_LEVEL,
+            serialize=True,
+            enqueue=True,
+        )
+    else:
+        logger.add(
+            sys.stderr,
+            level=settings.LOG_LEVEL,
+            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+            colorize=True,
         )
     
     return logger
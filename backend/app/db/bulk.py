@@ -0,0 +1,83 @@
+"""
+Bulk write helpers
+
+Large append-only writes (dataset items, evaluation results) go through
+here. On PostgreSQL with asyncpg they are streamed with COPY, which skips
+per-statement parsing; every other backend uses a Core executemany INSERT.
+"""
+from typing import Any, Dict, List, Type
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .ids import new_ids
+
+try:
+    import asyncpg
+except ImportError:  # asyncpg is only installed for PostgreSQL, the only backend using COPY
+    asyncpg = None
+
+# Below this many rows a multi-row INSERT is about as fast as COPY
+COPY_THRESHOLD = 500
+
+
+async def bulk_insert(db: AsyncSession, model: Type, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert plain dict rows into a model's table within the current transaction.
+
+    All rows must have the same keys, given as column attribute names. Rows
+    without an "id" are assigned one if the table has an id column. Python-side defaults of other columns
+    are not applied, so callers should pass every column they need; server
+    defaults (e.g. created_at) still apply.
+
+    Args:
+        db: Database session
+        model: Mapped model class
+        rows: Rows to insert
+    """
+    if not rows:
+        return
+
+    if "id" not in rows[0] and "id" in model.__table__.c:
+        for row, row_id in zip(rows, new_ids(len(rows))):
+            row["id"] = row_id
+
+    conn = await db.connection()
+    if conn.dialect.driver == "asyncpg" and len(rows) >= COPY_THRESHOLD:
+        await _copy_rows(conn, model, rows)
+    else:
+        await db.execute(insert(model), rows)
+
+
+async def _copy_rows(conn, model: Type, rows: List[Dict[str, Any]]) -> None:
+    """Write rows with asyncpg's binary COPY on the session's own connection"""
+    mapper = model.__mapper__
+    dialect = conn.dialect
+
+    keys = list(rows[0])
+    columns = [mapper.columns[key] for key in keys]
+
+    # Serialize values exactly as an INSERT would (JSON, compressed and enum columns)
+    processors = [column.type.dialect_impl(dialect).bind_processor(dialect) for column in columns]
+    records = [
+        tuple(
+            processor(row[key]) if processor else row[key]
+            for key, processor in zip(keys, processors)
+        )
+        for row in rows
+    ]
+
+    raw = await conn.get_raw_connection()
+    try:
+        await raw.driver_connection.copy_records_to_table(
+            model.__tablename__,
+            records=records,
+            columns=[column.name for column in columns],
+        )
+    except asyncpg.IntegrityConstraintViolationError as e:
+        # The raw driver call bypasses SQLAlchemy's error translation, raise
+        # what the INSERT path would so callers handle both the same way
+        raise IntegrityError(f"COPY {model.__tablename__}", None, e) from e
+    except asyncpg.PostgresError as e:
+        raise DBAPIError(f"COPY {model.__tablename__}", None, e) from e
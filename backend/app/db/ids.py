@@ -0,0 +1,17 @@
+"""
+Primary key generation
+"""
+import os
+import uuid
+from typing import List
+
+
+def new_id() -> str:
+    """Generate a random 32-character hex id"""
+    return uuid.uuid4().hex
+
+
+def new_ids(count: int) -> List[str]:
+    """Generate many random 32-character hex ids from a single urandom call"""
+    pool = os.urandom(16 * count).hex()
+    return [pool[i:i + 32] for i in range(0, 32 * count, 32)]
@@ -1,5 +1,5 @@
-from .dataset import Dataset, DatasetItem, DatasetVersion
-from .evaluation import EvaluationRun, EvaluationResult
+from .dataset import Dataset, DatasetItem, DatasetVersion, DatasetVersionItem
+from .evaluation import EvaluationRun, EvaluationResult, RunStatus
 
-__all__ = ["Dataset", "DatasetItem", "DatasetVersion", "EvaluationRun", "EvaluationResult"]
+__all__ = ["Dataset", "DatasetItem", "DatasetVersion", "DatasetVersionItem", "EvaluationRun", "EvaluationResult", "RunStatus"]
 
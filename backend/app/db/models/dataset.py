@@ -1,14 +1,21 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..session import Base
-import uuid
+from ..types import JSONType
+from ..ids import new_id
 
 
 class Dataset(Base):
     __tablename__ = "datasets"
+    # list_datasets pages through datasets newest first
+    __table_args__ = (
+        Index("ix_datasets_created_at", "created_at"),
+    )
+    # Fetch server-generated timestamps with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=new_id)
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     current_version = Column(Integer, default=1)
@@ -24,13 +31,18 @@ class Dataset(Base):
 
 class DatasetItem(Base):
     __tablename__ = "dataset_items"
+    # Item ids are generated client-side, so bulk inserts don't need RETURNING
+    __table_args__ = {"implicit_returning": False}
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    dataset_id = Column(String, ForeignKey("datasets.id"), nullable=False)
+    id = Column(String, primary_key=True, default=new_id)
+    dataset_id = Column(String, ForeignKey("datasets.id"), nullable=False, index=True)
     query = Column(Text, nullable=False)
-    ground_truth_docs = Column(JSON, nullable=True)
+    ground_truth_docs = Column(JSONType, nullable=True)
+    # Normalized ground truth keys, computed on write so runs don't re-normalize
+    ground_truth_index = Column(JSONType, nullable=True)
     ground_truth_answer = Column(Text, nullable=True)
-    metadata = Column(JSON, nullable=True)
+    # "metadata" is reserved by the declarative base, the DB column keeps its name
+    item_metadata = Column("metadata", JSONType, nullable=True)
     
     dataset = relationship("Dataset", back_populates="items")
     results = relationship("EvaluationResult", back_populates="dataset_item")
@@ -38,15 +50,32 @@ class DatasetItem(Base):
 
 class DatasetVersion(Base):
     __tablename__ = "dataset_versions"
+    # Covers list_versions (by dataset) and get_version (by dataset + number)
+    __table_args__ = (
+        Index("ix_versions_dataset_number", "dataset_id", "version_number"),
+    )
+    # Fetch server-generated timestamps with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, default=new_id)
     dataset_id = Column(String, ForeignKey("datasets.id"), nullable=False)
     version_number = Column(Integer, nullable=False)
     changes_summary = Column(Text, nullable=True)
     item_count = Column(Integer, default=0)
-    items_snapshot = Column(JSON, nullable=False)
+    snapshot_size_bytes = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     created_by = Column(String, nullable=True)
     
     dataset = relationship("Dataset", back_populates="versions")
 
+
+class DatasetVersionItem(Base):
+    """One item of a dataset version, as it was when the version was created"""
+    __tablename__ = "dataset_version_items"
+    
+    # The primary key doubles as the (version, item) index used by compare_versions
+    version_id = Column(String, ForeignKey("dataset_versions.id"), primary_key=True)
+    item_id = Column(String, primary_key=True)
+    position = Column(Integer, nullable=False)
+    content_hash = Column(String(16), nullable=False)
+    content = Column(JSONType, nullable=False)
@@ -1,11 +1,12 @@
 """
 Evaluation run and result models
 """
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON, Text, Float, Enum
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Float, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..session import Base
-import uuid
+from ..types import CompressedJSON, JSONType
+from ..ids import new_id
 import enum
 
 
@@ -20,8 +21,16 @@ class RunStatus(str, enum.Enum):
 class EvaluationRun(Base):
     """An evaluation run on a dataset with a RAG pipeline"""
     __tablename__ = "evaluation_runs"
-    
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # list_evaluation_runs orders by newest first, with or without a dataset
+    # filter; the composite index also serves lookups by dataset alone
+    __table_args__ = (
+        Index("ix_runs_created_at", "created_at"),
+        Index("ix_runs_dataset_created", "dataset_id", "created_at"),
+    )
+    # Fetch server-generated timestamps with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id = Column(String, primary_key=True, default=new_id)
     dataset_id = Column(String, ForeignKey("datasets.id"), nullable=False)
     
     # Run metadata
@@ -31,10 +40,10 @@ class EvaluationRun(Base):
     
     # RAG pipeline configuration
     rag_endpoint = Column(String, nullable=True)  # API endpoint if remote
-    rag_config = Column(JSON, nullable=True)  # Configuration parameters
+    rag_config = Column(JSONType, nullable=True)  # Configuration parameters
     
     # Aggregate metrics (computed after all items evaluated)
-    metrics = Column(JSON, nullable=True)
+    metrics = Column(JSONType, nullable=True)
     
     # Progress tracking
     total_items = Column(Integer, default=0)
@@ -56,18 +65,24 @@ class EvaluationRun(Base):
 class EvaluationResult(Base):
     """Result of evaluating a single query in a run"""
     __tablename__ = "evaluation_results"
-    
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Covers get_run_results (by run) as well as lookups by run + item. Result
+    # ids are generated client-side, so bulk inserts don't need RETURNING
+    __table_args__ = (
+        Index("ix_results_run_item", "run_id", "dataset_item_id"),
+        {"implicit_returning": False},
+    )
+    
+    id = Column(String, primary_key=True, default=new_id)
     run_id = Column(String, ForeignKey("evaluation_runs.id"), nullable=False)
-    dataset_item_id = Column(String, ForeignKey("dataset_items.id"), nullable=False)
+    dataset_item_id = Column(String, ForeignKey("dataset_items.id"), nullable=False, index=True)
     
     # RAG pipeline outputs
-    retrieved_docs = Column(JSON, nullable=True)  # List of retrieved documents
+    retrieved_docs = Column(CompressedJSON, nullable=True)  # List of retrieved documents
     generated_answer = Column(Text, nullable=True)
     
     # Retrieval metrics
-    recall_at_k = Column(JSON, nullable=True)  # {1: 0.5, 3: 0.8, 5: 1.0}
-    precision_at_k = Column(JSON, nullable=True)
+    recall_at_k = Column(JSONType, nullable=True)  # {1: 0.5, 3: 0.8, 5: 1.0}
+    precision_at_k = Column(JSONType, nullable=True)
     mrr = Column(Float, nullable=True)
     map_score = Column(Float, nullable=True)
     hit_rate = Column(Float, nullable=True)
@@ -83,11 +98,11 @@ class EvaluationResult(Base):
     
     # Hallucination detection
     hallucination_score = Column(Float, nullable=True)  # 0 = no hallucination, 1 = full hallucination
-    hallucinated_spans = Column(JSON, nullable=True)  # List of hallucinated text spans
+    hallucinated_spans = Column(CompressedJSON, nullable=True)  # List of hallucinated text spans
     citation_coverage = Column(Float, nullable=True)  # % of answer covered by citations
     
     # Detailed breakdowns
-    metrics_detail = Column(JSON, nullable=True)  # Additional metric details
+    metrics_detail = Column(CompressedJSON, nullable=True)  # Additional metric details
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
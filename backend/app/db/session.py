@@ -1,15 +1,38 @@
 """
 Database session management
 """
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from ..core.config import settings
+from ..core.serialization import json_dumps, json_loads
+
+# Prepared statements kept per connection on asyncpg (the driver defaults are 100)
+STATEMENT_CACHE_SIZE = 1024
+
+
+def _connect_args(url: str) -> dict:
+    """Driver-specific connection arguments"""
+    if make_url(url).get_driver_name() == "asyncpg":
+        return {
+            "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+            "statement_cache_size": STATEMENT_CACHE_SIZE,
+        }
+    return {}
+
 
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.ENV == "development",
     future=True,
+    json_serializer=json_dumps,
+    json_deserializer=json_loads,
+    # Rows per multi-row INSERT statement for bulk inserts
+    insertmanyvalues_page_size=1000,
+    # Compiled SQL kept for reuse, sized for every statement shape the app issues
+    query_cache_size=1200,
+    connect_args=_connect_args(settings.DATABASE_URL),
 )
 
 # Session factory
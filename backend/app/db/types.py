@@ -0,0 +1,58 @@
+"""
+Shared column types
+"""
+import zlib
+from typing import Any, Optional
+
+from sqlalchemy import JSON, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, zlib is used instead
+    zstandard = None
+
+from ..core.serialization import json_dumps, json_loads
+
+# Binary JSONB on Postgres, plain JSON elsewhere (e.g. SQLite in development)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+# First byte of a compressed payload, identifying the codec
+_CODEC_ZLIB = b"\x01"
+_CODEC_ZSTD = b"\x02"
+
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON value stored as a compressed blob.
+
+    Meant for large, write-once payloads that are never queried inside the
+    database (retrieved documents, metric breakdowns). Payloads are
+    compressed with zstd when available, otherwise zlib, and prefixed with a
+    codec byte so either can be read back.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+
+        payload = json_dumps(value).encode("utf-8")
+        if zstandard is not None:
+            return _CODEC_ZSTD + zstandard.ZstdCompressor(level=3).compress(payload)
+        return _CODEC_ZLIB + zlib.compress(payload, 3)
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        if value is None:
+            return None
+
+        codec, payload = value[:1], value[1:]
+        if codec == _CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed columns")
+            return json_loads(zstandard.ZstdDecompressor().decompress(payload))
+        if codec == _CODEC_ZLIB:
+            return json_loads(zlib.decompress(payload))
+        raise ValueError(f"Unknown compression codec: {codec!r}")
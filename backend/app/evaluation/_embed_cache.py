@@ -0,0 +1,83 @@
+"""
+Embedding cache shared by the evaluation metrics
+
+The same query, answer and retrieved documents are embedded by several
+metrics and, across a run, the same documents come back for many queries.
+Embeddings are cached per model, keyed by a hash of the text, in a bounded
+LRU so each distinct text is only encoded once. Cached vectors are stored
+as float16 by default, which halves the cache's memory; they are widened
+back to float32 when returned.
+"""
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import List
+
+import numpy as np
+
+from ..core.config import settings
+
+# One LRU per loaded model, dropped together with the model
+_caches: "weakref.WeakKeyDictionary[object, OrderedDict]" = weakref.WeakKeyDictionary()
+
+# Metrics run in worker threads; guards the LRUs (encoding runs outside it)
+_lock = threading.Lock()
+
+
+def embed_cached(model, texts: List[str], batch_size: int = 32) -> np.ndarray:
+    """
+    Embed texts, encoding only the ones not already cached.
+
+    Args:
+        model: SentenceTransformer-compatible embedding model
+        texts: Texts to embed
+        batch_size: Batch size for encoding the cache misses
+
+    Returns:
+        (len(texts), dim) array of L2-normalized embeddings, in input order
+    """
+    keys = [_text_key(text) for text in texts]
+
+    # Collect the hits, and the distinct misses so they are encoded in one call
+    found = {}
+    missing = {}
+    with _lock:
+        cache = _caches.get(model)
+        if cache is None:
+            cache = OrderedDict()
+            _caches[model] = cache
+
+        for key, text in zip(keys, texts):
+            if key in cache:
+                cache.move_to_end(key)
+                found[key] = cache[key]
+            elif key not in missing:
+                missing[key] = text
+
+    if missing:
+        embeddings = model.encode(
+            list(missing.values()),
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        if settings.EMBEDDING_CACHE_HALF_PRECISION:
+            embeddings = embeddings.astype(np.float16)
+        found.update(zip(missing, embeddings))
+
+        with _lock:
+            for key in missing:
+                cache[key] = found[key]
+            while len(cache) > settings.EMBEDDING_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    if not keys:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack([found[key] for key in keys]).astype(np.float32, copy=False)
+
+
+def _text_key(text: str) -> bytes:
+    """128-bit content hash of a text"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
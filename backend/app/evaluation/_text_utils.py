@@ -0,0 +1,77 @@
+"""
+Text helpers shared by the evaluation metrics
+"""
+import re
+import string
+from typing import Any, FrozenSet, Iterable, List, Set
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional, substring checks then fall back to `in`
+    ahocorasick = None
+
+# Sentence bodies between terminal punctuation
+_SENTENCE_RE = re.compile(r'[^.!?]+')
+
+# Deletes ASCII punctuation, so "answer." and "answer" are the same word
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+
+def split_into_sentences(text: str) -> List[str]:
+    """Split text into sentences, dropping fragments of 10 characters or fewer"""
+    sentences = (match.group().strip() for match in _SENTENCE_RE.finditer(text))
+    return [s for s in sentences if len(s) > 10]
+
+
+def word_set(text: str) -> FrozenSet[str]:
+    """Lowercased words of a text with punctuation removed"""
+    return frozenset(text.lower().translate(_PUNCT_TABLE).split())
+
+
+def extract_texts(docs: List[Any]) -> List[str]:
+    """Extract text from documents (plain strings or dicts with text/content/page_content)"""
+    texts = []
+    for doc in docs:
+        if isinstance(doc, str):
+            texts.append(doc)
+        elif isinstance(doc, dict):
+            text = doc.get('text') or doc.get('content') or doc.get('page_content')
+            if text:
+                texts.append(str(text))
+    return texts
+
+
+def find_contained(patterns: Iterable[str], texts: List[str]) -> Set[str]:
+    """
+    Find which patterns occur as a substring of at least one text.
+
+    With pyahocorasick installed all patterns are matched in a single pass
+    over each text instead of one scan per (pattern, text) pair.
+
+    Args:
+        patterns: Strings to look for (empty strings are ignored)
+        texts: Strings to search in
+
+    Returns:
+        Set of the patterns that were found
+    """
+    remaining = {pattern for pattern in patterns if pattern}
+    if not remaining or not texts:
+        return set()
+
+    if ahocorasick is None:
+        return {pattern for pattern in remaining if any(pattern in text for text in texts)}
+
+    automaton = ahocorasick.Automaton()
+    for pattern in remaining:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+
+    found = set()
+    for text in texts:
+        for _, pattern in automaton.iter(text):
+            found.add(pattern)
+        if len(found) == len(remaining):
+            break
+
+    return found
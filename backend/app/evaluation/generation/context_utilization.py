@@ -3,8 +3,8 @@ Context Utilization: Measures what percentage of the answer is backed by retriev
 
 Formula: % of answer sentences that have support in retrieved docs
 """
-from typing import List, Any, Dict
-import re
+from typing import List, Any, Dict, Set
+from .._text_utils import extract_texts, find_contained, split_into_sentences
 
 
 def calculate_context_utilization(
@@ -30,19 +30,27 @@ def calculate_context_utilization(
         return {"score": 0.0, "utilized_sentences": 0, "total_sentences": 1}
     
     # Extract context text
-    context_texts = _extract_texts(retrieved_docs)
+    context_texts = extract_texts(retrieved_docs)
     if not context_texts:
         return {"score": 0.0, "utilized_sentences": 0, "total_sentences": 1}
     
     # Split answer into sentences
-    sentences = _split_into_sentences(generated_answer)
+    sentences = split_into_sentences(generated_answer)
     if not sentences:
         return {"score": 1.0, "utilized_sentences": 0, "total_sentences": 0}
     
+    # Lowercase and tokenize each context once, not once per sentence
+    context_lowers = [context.lower() for context in context_texts]
+    context_word_sets = [frozenset(context_lower.split()) for context_lower in context_lowers]
+    
+    # Find every sentence quoted verbatim in some context in one pass
+    sentence_lowers = [sentence.lower() for sentence in sentences]
+    quoted = find_contained(sentence_lowers, context_lowers)
+    
     # Check how many sentences have context support
     utilized = 0
-    for sentence in sentences:
-        if _has_context_support(sentence, context_texts):
+    for sentence_lower in sentence_lowers:
+        if _has_context_support(sentence_lower, quoted, context_word_sets):
             utilized += 1
     
     score = utilized / len(sentences) if sentences else 0.0
@@ -54,39 +62,19 @@ def calculate_context_utilization(
     }
 
 
-def _extract_texts(docs: List[Any]) -> List[str]:
-    """Extract text from documents"""
-    texts = []
-    for doc in docs:
-        if isinstance(doc, str):
-            texts.append(doc)
-        elif isinstance(doc, dict):
-            text = doc.get('text') or doc.get('content') or doc.get('page_content')
-            if text:
-                texts.append(str(text))
-    return texts
-
-
-def _split_into_sentences(text: str) -> List[str]:
-    """Split text into sentences"""
-    sentences = re.split(r'[.!?]+', text)
-    return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
-
-
-def _has_context_support(sentence: str, context_texts: List[str]) -> bool:
-    """Check if sentence has support in context"""
-    sentence_lower = sentence.lower()
+def _has_context_support(
+    sentence_lower: str,
+    quoted: Set[str],
+    context_word_sets: List[frozenset]
+) -> bool:
+    """Check if a lowercased sentence has support in context"""
+    # Check substring match
+    if sentence_lower in quoted:
+        return True
     
-    for context in context_texts:
-        context_lower = context.lower()
-        
-        # Check substring match
-        if sentence_lower in context_lower:
-            return True
-        
+    sentence_words = set(sentence_lower.split())
+    for context_words in context_word_sets:
         # Check word overlap
-        sentence_words = set(sentence_lower.split())
-        context_words = set(context_lower.split())
         overlap = len(sentence_words & context_words)
         
         # If >50% overlap, consider it supported
@@ -94,4 +82,3 @@ def _has_context_support(sentence: str, context_texts: List[str]) -> bool:
             return True
     
     return False
-
@@ -9,7 +9,8 @@ Approach:
 Uses embedding similarity to check if claims are supported
 """
 from typing import List, Any, Dict, Optional
-import re
+from .._embed_cache import embed_cached
+from .._text_utils import extract_texts, split_into_sentences
 from ...core.logging import log
 
 
@@ -17,7 +18,8 @@ def calculate_faithfulness(
     generated_answer: str,
     retrieved_docs: List[Any],
     embedding_model=None,
-    threshold: float = 0.7
+    threshold: float = 0.7,
+    context_embs=None
 ) -> Dict[str, Any]:
     """
     Calculate faithfulness score: is answer grounded in context?
@@ -27,6 +29,7 @@ def calculate_faithfulness(
         retrieved_docs: Retrieved documents that should support the answer
         embedding_model: Optional embedding model for semantic similarity
         threshold: Similarity threshold for claim support
+        context_embs: Precomputed L2-normalized context embeddings (encoded here if missing)
         
     Returns:
         Dict with score and details about which claims are supported
@@ -38,27 +41,41 @@ def calculate_faithfulness(
         return {"score": 0.0, "supported_claims": 0, "total_claims": 1, "details": []}
     
     # Extract context text from documents
-    context_texts = _extract_texts(retrieved_docs)
+    context_texts = extract_texts(retrieved_docs)
     if not context_texts:
         return {"score": 0.0, "supported_claims": 0, "total_claims": 1, "details": []}
     
     # Break answer into claims (sentences)
-    claims = _split_into_sentences(generated_answer)
+    claims = split_into_sentences(generated_answer)
     if not claims:
         return {"score": 1.0, "supported_claims": 0, "total_claims": 0, "details": []}
     
-    # Check each claim
-    supported = 0
-    details = []
+    # Lowercase and tokenize each context once, not once per claim
+    context_lowers = [context.lower() for context in context_texts]
+    context_word_sets = [frozenset(context_lower.split()) for context_lower in context_lowers]
     
-    for claim in claims:
-        is_supported = _check_claim_support(claim, context_texts, embedding_model, threshold)
-        if is_supported:
-            supported += 1
-        details.append({
-            "claim": claim,
-            "supported": is_supported
-        })
+    # Cheap lexical check first
+    supported_flags = [
+        _check_claim_support(claim, context_lowers, context_word_sets)
+        for claim in claims
+    ]
+    
+    # Only embed the claims the lexical check could not support
+    residual = [i for i, is_supported in enumerate(supported_flags) if not is_supported]
+    if residual:
+        max_similarities = _max_claim_similarities(
+            [claims[i] for i in residual], context_texts, embedding_model, context_embs
+        )
+        if max_similarities is not None:
+            for i, max_similarity in zip(residual, max_similarities):
+                if max_similarity >= threshold:
+                    supported_flags[i] = True
+    
+    supported = sum(supported_flags)
+    details = [
+        {"claim": claim, "supported": is_supported}
+        for claim, is_supported in zip(claims, supported_flags)
+    ]
     
     score = supported / len(claims) if claims else 0.0
     
@@ -70,66 +87,51 @@ def calculate_faithfulness(
     }
 
 
-def _extract_texts(docs: List[Any]) -> List[str]:
-    """Extract text content from documents"""
-    texts = []
-    for doc in docs:
-        if isinstance(doc, str):
-            texts.append(doc)
-        elif isinstance(doc, dict):
-            text = doc.get('text') or doc.get('content') or doc.get('page_content')
-            if text:
-                texts.append(str(text))
-    return texts
-
-
-def _split_into_sentences(text: str) -> List[str]:
-    """Split text into sentences (claims)"""
-    # Simple sentence splitting - can be improved with NLTK
-    sentences = re.split(r'[.!?]+', text)
-    return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
+def _max_claim_similarities(
+    claims: List[str],
+    context_texts: List[str],
+    embedding_model,
+    context_embs=None
+) -> Optional[List[float]]:
+    """
+    Get each claim's highest cosine similarity to any context.
+    Returns None if no embedding model is available.
+    """
+    if embedding_model is None:
+        return None
+    
+    try:
+        claim_embs = embed_cached(embedding_model, claims, batch_size=64)
+        if context_embs is None:
+            context_embs = embed_cached(embedding_model, context_texts, batch_size=64)
+        
+        # (n_claims, n_contexts) cosine similarity matrix
+        similarities = claim_embs @ context_embs.T
+        return similarities.max(axis=1).tolist()
+    except Exception as e:
+        log.warning(f"Embedding similarity failed: {e}")
+        return None
 
 
 def _check_claim_support(
     claim: str,
-    context_texts: List[str],
-    embedding_model,
-    threshold: float
+    context_lowers: List[str],
+    context_word_sets: List[frozenset]
 ) -> bool:
     """
-    Check if a claim is supported by any context text.
-    Uses string matching or embedding similarity if model provided.
+    Check if a claim is supported by any context text using string matching.
+    Embedding similarity is handled separately for the claims this rejects.
     """
-    # Simple substring matching as fallback
     claim_lower = claim.lower()
-    for context in context_texts:
-        context_lower = context.lower()
-        
+    claim_words = set(claim_lower.split())
+    for context_lower, context_words in zip(context_lowers, context_word_sets):
         # Check for substring match (strong signal)
         if claim_lower in context_lower or context_lower in claim_lower:
             return True
         
         # Check for significant word overlap
-        claim_words = set(claim_lower.split())
-        context_words = set(context_lower.split())
         overlap = len(claim_words & context_words)
         if overlap >= min(len(claim_words) * 0.6, 5):  # 60% overlap or 5+ words
             return True
     
-    # If embedding model provided, use semantic similarity
-    if embedding_model is not None:
-        try:
-            from sentence_transformers import util
-            claim_emb = embedding_model.encode(claim, convert_to_tensor=True)
-            context_embs = embedding_model.encode(context_texts, convert_to_tensor=True)
-            
-            similarities = util.cos_sim(claim_emb, context_embs)[0]
-            max_sim = float(similarities.max())
-            
-            if max_sim >= threshold:
-                return True
-        except Exception as e:
-            log.warning(f"Embedding similarity failed: {e}")
-    
     return False
-
@@ -4,12 +4,23 @@ Answer Relevance: Measures if the answer addresses the question
 Uses semantic similarity between question and answer
 """
 from typing import Optional, Dict, Any
+from .._embed_cache import embed_cached
+from .._similarity import cosine_similarity
+from .._text_utils import word_set
+
+# Words ignored by the keyword relevance fallback
+_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+    'what', 'which', 'who', 'when', 'where', 'why', 'how', 'do', 'does'
+})
 
 
 def calculate_answer_relevance(
     query: str,
     generated_answer: str,
-    embedding_model=None
+    embedding_model=None,
+    query_emb=None,
+    answer_emb=None
 ) -> Dict[str, Any]:
     """
     Calculate answer relevance: does answer address the question?
@@ -18,6 +29,8 @@ def calculate_answer_relevance(
         query: The original query/question
         generated_answer: The generated answer
         embedding_model: Optional embedding model for semantic similarity
+        query_emb: Precomputed L2-normalized query embedding (encoded here if missing)
+        answer_emb: Precomputed L2-normalized answer embedding (encoded here if missing)
         
     Returns:
         Dict with relevance score and details
@@ -32,12 +45,13 @@ def calculate_answer_relevance(
     embedding_score = None
     if embedding_model is not None:
         try:
-            from sentence_transformers import util
-            query_emb = embedding_model.encode(query, convert_to_tensor=True)
-            answer_emb = embedding_model.encode(generated_answer, convert_to_tensor=True)
+            if query_emb is None:
+                query_emb = embed_cached(embedding_model, [query])[0]
+            if answer_emb is None:
+                answer_emb = embed_cached(embedding_model, [generated_answer])[0]
             
-            similarity = util.cos_sim(query_emb, answer_emb)[0][0]
-            embedding_score = float(similarity)
+            # Cosine similarity of L2-normalized embeddings
+            embedding_score = cosine_similarity(query_emb, answer_emb)
         except Exception:
             embedding_score = None
     
@@ -58,11 +72,8 @@ def _keyword_relevance(query: str, answer: str) -> float:
     Simple but effective baseline.
     """
     # Extract meaningful words (remove stopwords)
-    stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 
-                 'what', 'which', 'who', 'when', 'where', 'why', 'how', 'do', 'does'}
-    
-    query_words = set(query.lower().split()) - stopwords
-    answer_words = set(answer.lower().split()) - stopwords
+    query_words = word_set(query) - _STOPWORDS
+    answer_words = word_set(answer) - _STOPWORDS
     
     if not query_words:
         return 0.0
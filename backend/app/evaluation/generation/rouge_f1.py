@@ -96,16 +96,30 @@ def _simple_rouge_l(text1: str, text2: str) -> float:
 
 
 def _lcs_length(seq1: list, seq2: list) -> int:
-    """Calculate longest common subsequence length"""
-    m, n = len(seq1), len(seq2)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if seq1[i-1] == seq2[j-1]:
-                dp[i][j] = dp[i-1][j-1] + 1
-            else:
-                dp[i][j] = max(dp[i-1][j], dp[i][j-1])
-    
-    return dp[m][n]
-
+    """
+    Calculate longest common subsequence length.
+    
+    Bit-parallel LCS (Hyyro): each DP row is one Python int with a bit per
+    token of the longer sequence, so a row is updated with a few big-int
+    operations instead of a Python loop over every cell.
+    """
+    if len(seq1) < len(seq2):
+        seq1, seq2 = seq2, seq1
+    
+    m = len(seq1)
+    if not m or not seq2:
+        return 0
+    
+    # Bitmask of the positions of each token in the longer sequence
+    positions = {}
+    for i, token in enumerate(seq1):
+        positions[token] = positions.get(token, 0) | (1 << i)
+    
+    mask = (1 << m) - 1
+    row = mask
+    for token in seq2:
+        matches = row & positions.get(token, 0)
+        row = ((row + matches) | (row - matches)) & mask
+    
+    # Zero bits mark the positions that extended the subsequence
+    return m - bin(row).count("1")
@@ -4,12 +4,17 @@ Semantic Similarity: Measures similarity between generated answer and ground tru
 Uses embeddings to compare semantic meaning
 """
 from typing import Optional, Dict, Any
+from .._embed_cache import embed_cached
+from .._similarity import cosine_similarity
+from .._text_utils import word_set
 
 
 def calculate_semantic_similarity(
     generated_answer: str,
     ground_truth_answer: Optional[str],
-    embedding_model=None
+    embedding_model=None,
+    answer_emb=None,
+    ground_truth_emb=None
 ) -> Dict[str, Any]:
     """
     Calculate semantic similarity between generated and ground truth answers.
@@ -18,6 +23,8 @@ def calculate_semantic_similarity(
         generated_answer: The generated answer
         ground_truth_answer: The expected answer (optional)
         embedding_model: Embedding model for similarity computation
+        answer_emb: Precomputed L2-normalized answer embedding (encoded here if missing)
+        ground_truth_emb: Precomputed L2-normalized ground truth embedding (encoded here if missing)
         
     Returns:
         Dict with similarity score
@@ -32,13 +39,13 @@ def calculate_semantic_similarity(
     embedding_score = None
     if embedding_model is not None:
         try:
-            from sentence_transformers import util
+            if answer_emb is None:
+                answer_emb = embed_cached(embedding_model, [generated_answer])[0]
+            if ground_truth_emb is None:
+                ground_truth_emb = embed_cached(embedding_model, [ground_truth_answer])[0]
             
-            gen_emb = embedding_model.encode(generated_answer, convert_to_tensor=True)
-            gt_emb = embedding_model.encode(ground_truth_answer, convert_to_tensor=True)
-            
-            similarity = util.cos_sim(gen_emb, gt_emb)[0][0]
-            embedding_score = float(similarity)
+            # Cosine similarity of L2-normalized embeddings
+            embedding_score = cosine_similarity(answer_emb, ground_truth_emb)
         except Exception:
             embedding_score = None
     
@@ -55,14 +62,14 @@ def calculate_semantic_similarity(
 
 def _calculate_text_overlap(text1: str, text2: str) -> float:
     """Calculate simple word overlap between two texts"""
-    words1 = set(text1.lower().split())
-    words2 = set(text2.lower().split())
+    words1 = word_set(text1)
+    words2 = word_set(text2)
     
     if not words1 or not words2:
         return 0.0
     
     intersection = len(words1 & words2)
-    union = len(words1 | words2)
+    union = len(words1) + len(words2) - intersection
     
     # Jaccard similarity
     return intersection / union if union > 0 else 0.0
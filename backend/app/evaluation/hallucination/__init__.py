@@ -1,13 +1,15 @@
 """Hallucination detection system"""
-from .llm_judge import detect_hallucination_llm
+from .llm_judge import detect_hallucination_llm, detect_hallucination_llm_async
 from .citation_check import check_citations
 from .embedding_drift import calculate_embedding_drift
-from .aggregator import aggregate_hallucination_score
+from .aggregator import aggregate_hallucination_score, aggregate_hallucination_score_batch
 
 __all__ = [
     "detect_hallucination_llm",
+    "detect_hallucination_llm_async",
     "check_citations",
     "calculate_embedding_drift",
     "aggregate_hallucination_score",
+    "aggregate_hallucination_score_batch",
 ]
 
@@ -0,0 +1,29 @@
+"""
+Retrieved context prepared once for all hallucination checks
+"""
+from dataclasses import dataclass
+from typing import Any, FrozenSet, List
+
+from .._text_utils import extract_texts, word_set
+
+
+@dataclass(frozen=True)
+class ContextBundle:
+    """Context texts with their lowercased and tokenized forms"""
+    texts: List[str]
+    lower: List[str]
+    word_sets: List[FrozenSet[str]]
+    vocabulary: FrozenSet[str]  # union of word_sets
+
+
+def build_context(docs: List[Any]) -> ContextBundle:
+    """Extract, lowercase and tokenize retrieved documents in a single pass"""
+    texts = extract_texts(docs)
+    lower = [text.lower() for text in texts]
+    word_sets = [word_set(text_lower) for text_lower in lower]
+    return ContextBundle(
+        texts=texts,
+        lower=lower,
+        word_sets=word_sets,
+        vocabulary=frozenset().union(*word_sets)
+    )
@@ -5,6 +5,20 @@ Combines multiple hallucination detection signals into a single score.
 """
 from typing import Dict, Any, List
 
+import numpy as np
+
+
+# Weighted average (can be tuned)
+WEIGHTS = {
+    'llm_judge': 0.4,
+    'citation': 0.35,
+    'drift': 0.25
+}
+
+# Lower bounds of each severity level above "none"
+SEVERITY_BOUNDS = np.array([0.2, 0.4, 0.6, 0.8])
+SEVERITY_LEVELS = np.array(["none", "low", "medium", "high", "critical"])
+
 
 def aggregate_hallucination_score(
     llm_judge_result: Dict[str, Any],
@@ -22,74 +36,89 @@ def aggregate_hallucination_score(
     Returns:
         Aggregated hallucination score and detailed breakdown
     """
+    return aggregate_hallucination_score_batch([llm_judge_result], [citation_result], [drift_result])[0]
+
+
+def aggregate_hallucination_score_batch(
+    llm_judge_results: List[Dict[str, Any]],
+    citation_results: List[Dict[str, Any]],
+    drift_results: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate hallucination signals for many items at once.
+    
+    Scores and severities are computed as vector operations over the whole
+    batch; the per-item breakdowns are the same as the single-item version.
+    
+    Args:
+        llm_judge_results: Results from LLM judge, one per item
+        citation_results: Results from citation check, one per item
+        drift_results: Results from embedding drift, one per item
+        
+    Returns:
+        Aggregated hallucination score and detailed breakdown per item
+    """
+    if not llm_judge_results:
+        return []
+    
     # Extract individual signals
-    llm_confidence = llm_judge_result.get('confidence', 0.5)
-    citation_coverage = citation_result.get('citation_coverage', 0.0)
-    drift_score = drift_result.get('drift_score', 0.5)
+    llm_confidence = np.array([r.get('confidence', 0.5) for r in llm_judge_results], dtype=np.float64)
+    citation_coverage = np.array([r.get('citation_coverage', 0.0) for r in citation_results], dtype=np.float64)
+    drift_score = np.array([r.get('drift_score', 0.5) for r in drift_results], dtype=np.float64)
     
     # Convert citation coverage to hallucination signal (inverse)
     citation_hallucination = 1.0 - citation_coverage
     
-    # Weighted average (can be tuned)
-    weights = {
-        'llm_judge': 0.4,
-        'citation': 0.35,
-        'drift': 0.25
-    }
-    
-    aggregated_score = (
-        weights['llm_judge'] * llm_confidence +
-        weights['citation'] * citation_hallucination +
-        weights['drift'] * drift_score
+    aggregated_scores = (
+        WEIGHTS['llm_judge'] * llm_confidence +
+        WEIGHTS['citation'] * citation_hallucination +
+        WEIGHTS['drift'] * drift_score
     )
+    severities = _classify_severity(aggregated_scores)
     
-    # Collect all hallucinated spans
-    hallucinated_spans = []
-    
-    # From LLM judge
-    if llm_judge_result.get('hallucination_detected'):
-        hallucinated_spans.extend(llm_judge_result.get('unsupported_claims', []))
-    
-    # From citation check
-    hallucinated_spans.extend(citation_result.get('uncited_sentences', []))
-    
-    # Deduplicate
-    hallucinated_spans = list(set(hallucinated_spans))
-    
-    return {
-        "hallucination_score": round(aggregated_score, 4),
-        "hallucinated_spans": hallucinated_spans,
-        "breakdown": {
-            "llm_judge": {
-                "score": round(llm_confidence, 4),
-                "weight": weights['llm_judge'],
-                "detected": llm_judge_result.get('hallucination_detected', False)
-            },
-            "citation_check": {
-                "score": round(citation_hallucination, 4),
-                "weight": weights['citation'],
-                "coverage": round(citation_coverage, 4)
+    results = []
+    for i, (llm_judge_result, citation_result, drift_result) in enumerate(
+        zip(llm_judge_results, citation_results, drift_results)
+    ):
+        # Collect all hallucinated spans
+        hallucinated_spans = []
+        
+        # From LLM judge
+        if llm_judge_result.get('hallucination_detected'):
+            hallucinated_spans.extend(llm_judge_result.get('unsupported_claims', []))
+        
+        # From citation check
+        hallucinated_spans.extend(citation_result.get('uncited_sentences', []))
+        
+        # Deduplicate
+        hallucinated_spans = list(set(hallucinated_spans))
+        
+        results.append({
+            "hallucination_score": round(float(aggregated_scores[i]), 4),
+            "hallucinated_spans": hallucinated_spans,
+            "breakdown": {
+                "llm_judge": {
+                    "score": round(float(llm_confidence[i]), 4),
+                    "weight": WEIGHTS['llm_judge'],
+                    "detected": llm_judge_result.get('hallucination_detected', False)
+                },
+                "citation_check": {
+                    "score": round(float(citation_hallucination[i]), 4),
+                    "weight": WEIGHTS['citation'],
+                    "coverage": round(float(citation_coverage[i]), 4)
+                },
+                "embedding_drift": {
+                    "score": round(float(drift_score[i]), 4),
+                    "weight": WEIGHTS['drift'],
+                    "avg_similarity": drift_result.get('avg_similarity', 0.0)
+                }
             },
-            "embedding_drift": {
-                "score": round(drift_score, 4),
-                "weight": weights['drift'],
-                "avg_similarity": drift_result.get('avg_similarity', 0.0)
-            }
-        },
-        "severity": _classify_severity(aggregated_score)
-    }
-
+            "severity": str(severities[i])
+        })
+    
+    return results
 
-def _classify_severity(score: float) -> str:
-    """Classify hallucination severity"""
-    if score < 0.2:
-        return "none"
-    elif score < 0.4:
-        return "low"
-    elif score < 0.6:
-        return "medium"
-    elif score < 0.8:
-        return "high"
-    else:
-        return "critical"
 
+def _classify_severity(scores: np.ndarray) -> np.ndarray:
+    """Classify hallucination severity for an array of scores"""
+    return SEVERITY_LEVELS[np.searchsorted(SEVERITY_BOUNDS, scores, side='right')]
@@ -4,14 +4,16 @@ Citation Check: Verify that each sentence in the answer can be mapped to retriev
 Each answer sentence should have a "citation" (supporting evidence) in the context.
 If a sentence lacks citation, it's potentially hallucinated.
 """
-from typing import List, Any, Dict
-import re
+from typing import List, Any, Dict, Optional
+from .._text_utils import find_contained, split_into_sentences, word_set
+from ._context import ContextBundle, build_context
 
 
 def check_citations(
     generated_answer: str,
     retrieved_docs: List[Any],
-    threshold: float = 0.5
+    threshold: float = 0.5,
+    ctx: Optional[ContextBundle] = None
 ) -> Dict[str, Any]:
     """
     Check citation coverage: can each answer sentence be cited to context?
@@ -20,6 +22,7 @@ def check_citations(
         generated_answer: The generated answer
         retrieved_docs: Retrieved documents (potential citations)
         threshold: Minimum word overlap to consider a citation valid
+        ctx: Prepared context (built from retrieved_docs if missing)
         
     Returns:
         Dict with citation coverage and uncited sentences
@@ -33,7 +36,7 @@ def check_citations(
         }
     
     if not retrieved_docs:
-        sentences = _split_into_sentences(generated_answer)
+        sentences = split_into_sentences(generated_answer)
         return {
             "citation_coverage": 0.0,
             "cited_sentences": 0,
@@ -41,11 +44,12 @@ def check_citations(
             "uncited_sentences": sentences
         }
     
-    # Extract context
-    context_texts = _extract_texts(retrieved_docs)
+    # Extract, lowercase and tokenize context
+    if ctx is None:
+        ctx = build_context(retrieved_docs)
     
     # Split answer into sentences
-    sentences = _split_into_sentences(generated_answer)
+    sentences = split_into_sentences(generated_answer)
     
     if not sentences:
         return {
@@ -55,12 +59,19 @@ def check_citations(
             "uncited_sentences": []
         }
     
+    # Sentences quoted verbatim in any context (strong citation), found in one pass
+    sentence_lowers = [sentence.lower() for sentence in sentences]
+    quoted = find_contained(sentence_lowers, ctx.lower)
+    
     # Check each sentence for citation
     cited = 0
     uncited = []
     
-    for sentence in sentences:
-        has_citation = _find_citation(sentence, context_texts, threshold)
+    for sentence, sentence_lower in zip(sentences, sentence_lowers):
+        has_citation = (
+            sentence_lower in quoted
+            or _find_citation(sentence_lower, ctx.word_sets, ctx.vocabulary, threshold)
+        )
         if has_citation:
             cited += 1
         else:
@@ -76,45 +87,29 @@ def check_citations(
     }
 
 
-def _split_into_sentences(text: str) -> List[str]:
-    """Split text into sentences"""
-    sentences = re.split(r'[.!?]+', text)
-    return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
-
-
-def _extract_texts(docs: List[Any]) -> List[str]:
-    """Extract text from documents"""
-    texts = []
-    for doc in docs:
-        if isinstance(doc, str):
-            texts.append(doc)
-        elif isinstance(doc, dict):
-            text = doc.get('text') or doc.get('content') or doc.get('page_content')
-            if text:
-                texts.append(str(text))
-    return texts
-
-
-def _find_citation(sentence: str, context_texts: List[str], threshold: float) -> bool:
+def _find_citation(
+    sentence_lower: str,
+    context_word_sets: List[frozenset],
+    context_vocabulary: frozenset,
+    threshold: float
+) -> bool:
     """
-    Find if sentence has a citation (support) in context.
-    Uses word overlap as proxy for citation.
+    Find if a lowercased sentence has a citation (support) in context.
+    Uses word overlap as proxy for citation; verbatim quotes are matched
+    by the caller.
     """
-    sentence_lower = sentence.lower()
-    sentence_words = set(sentence_lower.split())
+    sentence_words = word_set(sentence_lower)
     
     if not sentence_words:
         return False
     
-    for context in context_texts:
-        context_lower = context.lower()
-        
-        # Check for substring match (strong citation)
-        if sentence_lower in context_lower:
-            return True
-        
+    # Overlap with any one context is at most the overlap with all of them,
+    # so most unsupported sentences are rejected without the per-context loop
+    if len(sentence_words & context_vocabulary) / len(sentence_words) < threshold:
+        return False
+    
+    for context_words in context_word_sets:
         # Check for word overlap (weaker citation)
-        context_words = set(context_lower.split())
         overlap = len(sentence_words & context_words)
         overlap_ratio = overlap / len(sentence_words)
         
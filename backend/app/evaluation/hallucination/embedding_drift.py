@@ -3,13 +3,20 @@ Embedding Drift: Measure semantic distance between answer and retrieved document
 
 If answer embedding drifts too far from context embeddings, it may be hallucinated.
 """
-from typing import List, Any, Dict, Optional
+from typing import List, Any, Dict, Optional, FrozenSet
+import numpy as np
+from .._embed_cache import embed_cached
+from .._text_utils import word_set
+from ._context import ContextBundle, build_context
 
 
 def calculate_embedding_drift(
     generated_answer: str,
     retrieved_docs: List[Any],
-    embedding_model=None
+    embedding_model=None,
+    answer_emb=None,
+    context_embs=None,
+    ctx: Optional[ContextBundle] = None
 ) -> Dict[str, Any]:
     """
     Calculate embedding drift between answer and context.
@@ -18,6 +25,9 @@ def calculate_embedding_drift(
         generated_answer: The generated answer
         retrieved_docs: Retrieved documents
         embedding_model: Embedding model for computing similarity
+        answer_emb: Precomputed L2-normalized answer embedding (encoded here if missing)
+        context_embs: Precomputed L2-normalized context embeddings (encoded here if missing)
+        ctx: Prepared context (built from retrieved_docs if missing)
         
     Returns:
         Dict with drift score (0 = no drift, 1 = high drift)
@@ -32,7 +42,9 @@ def calculate_embedding_drift(
         }
     
     # Extract context texts
-    context_texts = _extract_texts(retrieved_docs)
+    if ctx is None:
+        ctx = build_context(retrieved_docs)
+    context_texts = ctx.texts
     
     if not context_texts:
         return {
@@ -45,21 +57,22 @@ def calculate_embedding_drift(
     
     # If no embedding model, use text overlap
     if embedding_model is None:
-        return _text_based_drift(generated_answer, context_texts)
+        return _text_based_drift(generated_answer, ctx.word_sets)
     
     # Compute embedding similarities
     try:
-        from sentence_transformers import util
+        if answer_emb is None:
+            answer_emb = embed_cached(embedding_model, [generated_answer])[0]
+        if context_embs is None:
+            # Encoding the whole list lets the model sort by length and pad per batch
+            context_embs = embed_cached(embedding_model, context_texts, batch_size=64)
         
-        answer_emb = embedding_model.encode(generated_answer, convert_to_tensor=True)
-        context_embs = embedding_model.encode(context_texts, convert_to_tensor=True)
+        # Cosine similarity is a plain dot product on normalized embeddings
+        similarities = (context_embs @ answer_emb).astype(np.float64)
         
-        similarities = util.cos_sim(answer_emb, context_embs)[0]
-        similarities = [float(s) for s in similarities]
-        
-        avg_sim = sum(similarities) / len(similarities)
-        max_sim = max(similarities)
-        min_sim = min(similarities)
+        avg_sim = float(similarities.mean())
+        max_sim = float(similarities.max())
+        min_sim = float(similarities.min())
         
         # Drift = inverse of similarity (1 - similarity)
         drift = 1.0 - avg_sim
@@ -73,26 +86,24 @@ def calculate_embedding_drift(
         }
         
     except Exception:
-        return _text_based_drift(generated_answer, context_texts)
+        return _text_based_drift(generated_answer, ctx.word_sets)
 
 
-def _text_based_drift(answer: str, context_texts: List[str]) -> Dict[str, Any]:
+def _text_based_drift(answer: str, context_word_sets: List[FrozenSet[str]]) -> Dict[str, Any]:
     """
     Calculate drift using text overlap (fallback method).
     """
-    answer_words = set(answer.lower().split())
+    answer_words = word_set(answer)
     
     similarities = []
-    for context in context_texts:
-        context_words = set(context.lower().split())
-        
+    for context_words in context_word_sets:
         if not answer_words or not context_words:
             similarities.append(0.0)
             continue
         
-        # Jaccard similarity
+        # Jaccard similarity (union size by inclusion-exclusion, no union set is built)
         intersection = len(answer_words & context_words)
-        union = len(answer_words | context_words)
+        union = len(answer_words) + len(context_words) - intersection
         sim = intersection / union if union > 0 else 0.0
         similarities.append(sim)
     
@@ -115,17 +126,3 @@ def _text_based_drift(answer: str, context_texts: List[str]) -> Dict[str, Any]:
         "max_similarity": round(max(similarities), 4),
         "method": "text_overlap"
     }
-
-
-def _extract_texts(docs: List[Any]) -> List[str]:
-    """Extract text from documents"""
-    texts = []
-    for doc in docs:
-        if isinstance(doc, str):
-            texts.append(doc)
-        elif isinstance(doc, dict):
-            text = doc.get('text') or doc.get('content') or doc.get('page_content')
-            if text:
-                texts.append(str(text))
-    return texts
-
@@ -4,15 +4,27 @@ LLM-as-Judge Hallucination Detection
 Uses an LLM to evaluate if claims in the answer are supported by context.
 Prompts the LLM to identify unsupported or contradictory statements.
 """
+from functools import lru_cache
 from typing import List, Any, Dict, Optional
 import re
+from .._text_utils import split_into_sentences, word_set
+from ._context import ContextBundle, build_context
 from ...core.logging import log
 
+# Lines of the judge response: verdict, first number on the confidence line, claims
+_RESPONSE_RE = re.compile(
+    r'^(?:HALLUCINATION:(?P<verdict>.*)'
+    r'|CONFIDENCE:[^\d.\n]*(?P<confidence>[\d.]*)'
+    r'|- (?P<claim>.*))',
+    re.MULTILINE
+)
+
 
 def detect_hallucination_llm(
     generated_answer: str,
     retrieved_docs: List[Any],
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    ctx: Optional[ContextBundle] = None
 ) -> Dict[str, Any]:
     """
     Use LLM to judge if answer contains hallucinations.
@@ -21,10 +33,73 @@ def detect_hallucination_llm(
         generated_answer: The generated answer to evaluate
         retrieved_docs: Retrieved documents (context)
         api_key: OpenAI API key (optional)
+        ctx: Prepared context (built from retrieved_docs if missing)
         
     Returns:
         Dict with hallucination assessment and identified spans
     """
+    early_result = _check_inputs(generated_answer, retrieved_docs)
+    if early_result is not None:
+        return early_result
+    
+    # Extract context text
+    if ctx is None:
+        ctx = build_context(retrieved_docs)
+    
+    # Try OpenAI if API key provided
+    if api_key:
+        try:
+            result = _llm_judge_openai(generated_answer, _context_str(ctx), api_key)
+            if result:
+                return result
+        except Exception as e:
+            log.warning(f"OpenAI LLM judge failed: {e}")
+    
+    # Fallback to rule-based detection
+    return _rule_based_detection(generated_answer, ctx)
+
+
+async def detect_hallucination_llm_async(
+    generated_answer: str,
+    retrieved_docs: List[Any],
+    api_key: Optional[str] = None,
+    ctx: Optional[ContextBundle] = None
+) -> Dict[str, Any]:
+    """
+    Async version of detect_hallucination_llm.
+    
+    The OpenAI request is awaited instead of blocking, so it can overlap
+    with the other hallucination checks.
+    
+    Args:
+        generated_answer: The generated answer to evaluate
+        retrieved_docs: Retrieved documents (context)
+        api_key: OpenAI API key (optional)
+        ctx: Prepared context (built from retrieved_docs if missing)
+        
+    Returns:
+        Dict with hallucination assessment and identified spans
+    """
+    early_result = _check_inputs(generated_answer, retrieved_docs)
+    if early_result is not None:
+        return early_result
+    
+    if ctx is None:
+        ctx = build_context(retrieved_docs)
+    
+    if api_key:
+        try:
+            result = await _llm_judge_openai_async(generated_answer, _context_str(ctx), api_key)
+            if result:
+                return result
+        except Exception as e:
+            log.warning(f"OpenAI LLM judge failed: {e}")
+    
+    return _rule_based_detection(generated_answer, ctx)
+
+
+def _check_inputs(generated_answer: str, retrieved_docs: List[Any]) -> Optional[Dict[str, Any]]:
+    """Result for an empty answer or missing context, None if the answer can be judged"""
     if not generated_answer or not generated_answer.strip():
         return {
             "hallucination_detected": False,
@@ -42,21 +117,26 @@ def detect_hallucination_llm(
             "method": "no_context"
         }
     
-    # Extract context text
-    context_texts = _extract_texts(retrieved_docs)
-    context_str = "\n\n".join(context_texts[:3])  # Use top 3 docs
-    
-    # Try OpenAI if API key provided
-    if api_key:
-        try:
-            result = _llm_judge_openai(generated_answer, context_str, api_key)
-            if result:
-                return result
-        except Exception as e:
-            log.warning(f"OpenAI LLM judge failed: {e}")
-    
-    # Fallback to rule-based detection
-    return _rule_based_detection(generated_answer, context_texts)
+    return None
+
+
+def _context_str(ctx: ContextBundle) -> str:
+    """Context passed to the judge"""
+    return "\n\n".join(ctx.texts[:3])  # Use top 3 docs
+
+
+@lru_cache(maxsize=8)
+def _get_client(api_key: str):
+    """OpenAI client per API key, reused so connections are kept alive between calls"""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=8)
+def _get_async_client(api_key: str):
+    """AsyncOpenAI client per API key, reused so connections are kept alive between calls"""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=api_key)
 
 
 def _llm_judge_openai(answer: str, context: str, api_key: str) -> Optional[Dict[str, Any]]:
@@ -64,11 +144,48 @@ def _llm_judge_openai(answer: str, context: str, api_key: str) -> Optional[Dict[
     Use OpenAI to judge hallucinations.
     """
     try:
-        from openai import OpenAI
+        client = _get_client(api_key)
+        
+        response = client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": _build_prompt(answer, context)}],
+            temperature=0.0,
+            max_tokens=500
+        )
         
-        client = OpenAI(api_key=api_key)
+        result_text = response.choices[0].message.content
+        return _parse_llm_response(result_text)
         
-        prompt = f"""You are an AI evaluator. Your task is to determine if the ANSWER contains any hallucinations (unsupported or contradictory claims) when compared to the CONTEXT.
+    except Exception as e:
+        log.error(f"OpenAI LLM judge error: {e}")
+        return None
+
+
+async def _llm_judge_openai_async(answer: str, context: str, api_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Use OpenAI to judge hallucinations without blocking the event loop.
+    """
+    try:
+        client = _get_async_client(api_key)
+        
+        response = await client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": _build_prompt(answer, context)}],
+            temperature=0.0,
+            max_tokens=500
+        )
+        
+        result_text = response.choices[0].message.content
+        return _parse_llm_response(result_text)
+        
+    except Exception as e:
+        log.error(f"OpenAI LLM judge error: {e}")
+        return None
+
+
+def _build_prompt(answer: str, context: str) -> str:
+    """Judge prompt for an answer and its context"""
+    return f"""You are an AI evaluator. Your task is to determine if the ANSWER contains any hallucinations (unsupported or contradictory claims) when compared to the CONTEXT.
 
 CONTEXT:
 {context}
@@ -90,39 +207,26 @@ UNSUPPORTED_CLAIMS:
 
 Be strict in your evaluation."""
 
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,
-            max_tokens=500
-        )
-        
-        result_text = response.choices[0].message.content
-        return _parse_llm_response(result_text)
-        
-    except Exception as e:
-        log.error(f"OpenAI LLM judge error: {e}")
-        return None
-
 
 def _parse_llm_response(response: str) -> Dict[str, Any]:
     """Parse LLM response into structured format"""
-    lines = response.strip().split('\n')
-    
     hallucination_detected = False
     confidence = 0.5
     unsupported_claims = []
     
-    for line in lines:
-        if line.startswith("HALLUCINATION:"):
-            hallucination_detected = "YES" in line.upper()
-        elif line.startswith("CONFIDENCE:"):
+    for match in _RESPONSE_RE.finditer(response.strip()):
+        field = match.lastgroup
+        value = match.group(field)
+        
+        if field == "verdict":
+            hallucination_detected = "YES" in value.upper()
+        elif field == "confidence":
             try:
-                confidence = float(re.search(r'[\d.]+', line).group())
-            except:
+                confidence = float(value)
+            except ValueError:
                 confidence = 0.5
-        elif line.startswith("- "):
-            claim = line[2:].strip()
+        else:
+            claim = value.strip()
             if claim:
                 unsupported_claims.append(claim)
     
@@ -134,19 +238,18 @@ def _parse_llm_response(response: str) -> Dict[str, Any]:
     }
 
 
-def _rule_based_detection(answer: str, context_texts: List[str]) -> Dict[str, Any]:
+def _rule_based_detection(answer: str, ctx: ContextBundle) -> Dict[str, Any]:
     """
     Rule-based hallucination detection (fallback).
     Checks if answer claims are in context.
     """
     # Split answer into sentences
-    sentences = re.split(r'[.!?]+', answer)
-    sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
+    sentences = split_into_sentences(answer)
     
     unsupported = []
     
     for sentence in sentences:
-        if not _has_support(sentence, context_texts):
+        if not _has_support(sentence, ctx.lower, ctx.word_sets):
             unsupported.append(sentence)
     
     total = len(sentences)
@@ -160,20 +263,21 @@ def _rule_based_detection(answer: str, context_texts: List[str]) -> Dict[str, An
     }
 
 
-def _has_support(sentence: str, context_texts: List[str]) -> bool:
-    """Check if sentence has support in context"""
+def _has_support(
+    sentence: str,
+    context_lowers: List[str],
+    context_word_sets: List[frozenset]
+) -> bool:
+    """Check if sentence has support in context (contexts are already lowercased)"""
     sentence_lower = sentence.lower()
-    sentence_words = set(sentence_lower.split())
+    sentence_words = word_set(sentence_lower)
     
-    for context in context_texts:
-        context_lower = context.lower()
-        
+    for context_lower, context_words in zip(context_lowers, context_word_sets):
         # Substring match
         if sentence_lower in context_lower:
             return True
         
         # Word overlap
-        context_words = set(context_lower.split())
         overlap = len(sentence_words & context_words)
         
         # If >60% overlap, consider supported
@@ -181,17 +285,3 @@ def _has_support(sentence: str, context_texts: List[str]) -> bool:
             return True
     
     return False
-
-
-def _extract_texts(docs: List[Any]) -> List[str]:
-    """Extract text from documents"""
-    texts = []
-    for doc in docs:
-        if isinstance(doc, str):
-            texts.append(doc)
-        elif isinstance(doc, dict):
-            text = doc.get('text') or doc.get('content') or doc.get('page_content')
-            if text:
-                texts.append(str(text))
-    return texts
-
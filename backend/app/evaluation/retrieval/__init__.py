@@ -1,10 +1,16 @@
 """Retrieval quality metrics"""
-from .recall import calculate_recall_at_k
-from .precision import calculate_precision_at_k
-from .mrr import calculate_mrr
-from .map import calculate_map
-from .hit_rate import calculate_hit_rate
-from .coverage import calculate_coverage
+from .recall import calculate_recall_at_k, calculate_recall_at_k_pre
+from .precision import calculate_precision_at_k, calculate_precision_at_k_pre
+from .mrr import calculate_mrr, calculate_mrr_pre, find_first_relevant_rank
+from .map import calculate_map, calculate_map_pre
+from .hit_rate import calculate_hit_rate, calculate_hit_rate_pre
+from .coverage import calculate_coverage, calculate_coverage_pre
+from ._normalize import (
+    DEFAULT_K_VALUES,
+    normalize_docs_list,
+    normalize_docs_set,
+    build_ground_truth_index,
+)
 
 __all__ = [
     "calculate_recall_at_k",
@@ -13,5 +19,15 @@ __all__ = [
     "calculate_map",
     "calculate_hit_rate",
     "calculate_coverage",
+    "calculate_recall_at_k_pre",
+    "calculate_precision_at_k_pre",
+    "calculate_mrr_pre",
+    "calculate_map_pre",
+    "calculate_hit_rate_pre",
+    "calculate_coverage_pre",
+    "find_first_relevant_rank",
+    "DEFAULT_K_VALUES",
+    "normalize_docs_list",
+    "normalize_docs_set",
+    "build_ground_truth_index",
 ]
-
@@ -0,0 +1,129 @@
+"""
+Document normalization shared by the retrieval metrics
+
+Documents are compared by a string key: the document itself if it is a
+string, its id field if it is a dict with one, else the first 200
+characters of its text.
+
+Each metric has a *_pre variant taking already normalized documents (a
+ranked list of retrieved keys and a set of ground truth keys), so a caller
+computing several metrics for the same item normalizes only once.
+"""
+from typing import Any, FrozenSet, List, Optional
+
+# K values reported for Recall@K and Precision@K
+DEFAULT_K_VALUES = (1, 3, 5, 10)
+
+_ID_KEYS = ('id', 'doc_id', 'document_id')
+_TEXT_KEYS = ('text', 'content', 'page_content')
+
+
+def _dict_key(doc: dict) -> Optional[str]:
+    """Key of a dict document: its id field, else its text prefix"""
+    for key in _ID_KEYS:
+        doc_id = doc.get(key)
+        if doc_id:
+            return str(doc_id)
+    # The text prefix is the key itself rather than a digest of it: slicing
+    # is cheaper than hashing in Python, and it still matches a plain
+    # string document with the same text
+    for key in _TEXT_KEYS:
+        text = doc.get(key)
+        if text:
+            return str(text)[:200]
+    return None
+
+
+def doc_key(doc: Any) -> Optional[str]:
+    """Get the comparison key of a document (None for dicts without id or text)"""
+    if isinstance(doc, str):
+        return doc
+    if isinstance(doc, dict):
+        return _dict_key(doc)
+    return str(doc)
+
+
+# Key function per exact document type, looked up once per document in the
+# mixed-list path. Strings are their own key and skip the call; subclasses
+# and any other type go through doc_key.
+_KEY_BY_TYPE = {dict: _dict_key}
+
+
+def _mixed_keys(docs: List[Any]) -> List[str]:
+    """Keys of a list of documents of any shape, skipping keyless dicts"""
+    get_key = _KEY_BY_TYPE.get
+    keys = []
+    for doc in docs:
+        doc_type = type(doc)
+        if doc_type is str:
+            keys.append(doc)
+            continue
+        key = get_key(doc_type, doc_key)(doc)
+        if key is not None:
+            keys.append(key)
+    return keys
+
+
+def _uniform_keys(docs: List[Any]) -> Optional[List[str]]:
+    """
+    Keys of a list of plain strings or of dicts with a string "id", None otherwise.
+
+    Documents in a list almost always share one shape. Checking that once
+    for the whole list lets the keys be taken with a single comprehension
+    instead of a doc_key call per document; any other list goes through
+    doc_key as before.
+    """
+    types = set(map(type, docs))
+    if types == {str}:
+        return list(docs)
+    if types == {dict}:
+        keys = [doc.get(_ID_KEYS[0]) for doc in docs]
+        if all(keys) and set(map(type, keys)) == {str}:
+            return keys
+    return None
+
+
+def normalize_docs_list(docs: List[Any]) -> List[str]:
+    """Normalize documents to a list of keys (preserving rank order)"""
+    keys = _uniform_keys(docs)
+    if keys is not None:
+        return keys
+    return _mixed_keys(docs)
+
+
+def normalize_docs_set(docs: List[Any]) -> FrozenSet[str]:
+    """Normalize documents to a read-only set of keys"""
+    keys = _uniform_keys(docs)
+    if keys is None:
+        keys = _mixed_keys(docs)
+    return frozenset(keys)
+
+
+def build_ground_truth_index(docs: Optional[List[Any]]) -> Optional[List[str]]:
+    """
+    Normalized ground truth keys of a dataset item, in a JSON-storable form.
+
+    Stored with the item at upload time so evaluation runs read the keys
+    instead of normalizing the same ground truth documents on every run.
+    None for items without ground truth documents.
+    """
+    if not docs:
+        return None
+    return sorted(normalize_docs_set(docs))
+
+
+def relevant_counts(retrieved_list: List[str], gt_set: FrozenSet[str], limit: int) -> List[int]:
+    """
+    Running count of distinct relevant documents over the top ranks.
+
+    Entry i is the number of distinct ground truth documents within the top
+    i + 1 retrieved ones, for the first `limit` ranks. Precision@K and
+    Recall@K for every K are read off this in one pass.
+    """
+    counts = []
+    seen = set()
+    for doc in retrieved_list[:limit]:
+        if doc in gt_set and doc not in seen:
+            seen.add(doc)
+        counts.append(len(seen))
+    return counts
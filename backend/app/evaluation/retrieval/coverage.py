@@ -4,7 +4,8 @@ Coverage: Fraction of ground truth documents that were retrieved
 Formula: Coverage = (# GT docs retrieved) / (total # GT docs)
 This is essentially Recall without the @K constraint
 """
-from typing import List, Any
+from typing import List, Any, FrozenSet
+from ._normalize import normalize_docs_list, normalize_docs_set
 
 
 def calculate_coverage(
@@ -28,31 +29,28 @@ def calculate_coverage(
         return 0.0
     
     # Normalize documents
-    gt_set = _normalize_docs_set(ground_truth_docs)
-    retrieved_set = _normalize_docs_set(retrieved_docs)
+    return calculate_coverage_pre(
+        normalize_docs_list(retrieved_docs),
+        normalize_docs_set(ground_truth_docs)
+    )
+
+
+def calculate_coverage_pre(retrieved_list: List[str], gt_set: FrozenSet[str]) -> float:
+    """
+    Calculate coverage from normalized documents.
+    
+    Args:
+        retrieved_list: Normalized retrieved document keys
+        gt_set: Normalized ground truth document keys
+        
+    Returns:
+        Coverage score between 0 and 1
+    """
+    if not gt_set:
+        return 0.0
     
     # Calculate overlap
-    covered = len(gt_set & retrieved_set)
+    covered = len(gt_set.intersection(retrieved_list))
     coverage = covered / len(gt_set)
     
     return round(coverage, 4)
-
-
-def _normalize_docs_set(docs: List[Any]) -> set:
-    """Normalize documents to set for comparison"""
-    normalized = set()
-    for doc in docs:
-        if isinstance(doc, str):
-            normalized.add(doc)
-        elif isinstance(doc, dict):
-            doc_id = doc.get('id') or doc.get('doc_id') or doc.get('document_id')
-            if doc_id:
-                normalized.add(str(doc_id))
-            else:
-                text = doc.get('text') or doc.get('content') or doc.get('page_content')
-                if text:
-                    normalized.add(str(text)[:200])
-        else:
-            normalized.add(str(doc))
-    return normalized
-
@@ -3,7 +3,8 @@ Hit Rate: Binary metric indicating if at least one relevant document was retriev
 
 Formula: Hit Rate = 1 if any relevant doc in results, else 0
 """
-from typing import List, Any
+from typing import List, Any, FrozenSet
+from ._normalize import normalize_docs_list, normalize_docs_set
 
 
 def calculate_hit_rate(
@@ -24,29 +25,23 @@ def calculate_hit_rate(
         return 0.0
     
     # Normalize documents
-    gt_set = _normalize_docs_set(ground_truth_docs)
-    retrieved_set = _normalize_docs_set(retrieved_docs)
-    
-    # Check if any overlap exists
-    has_hit = len(gt_set & retrieved_set) > 0
-    return 1.0 if has_hit else 0.0
-
+    return calculate_hit_rate_pre(
+        normalize_docs_list(retrieved_docs),
+        normalize_docs_set(ground_truth_docs)
+    )
 
-def _normalize_docs_set(docs: List[Any]) -> set:
-    """Normalize documents to set for comparison"""
-    normalized = set()
-    for doc in docs:
-        if isinstance(doc, str):
-            normalized.add(doc)
-        elif isinstance(doc, dict):
-            doc_id = doc.get('id') or doc.get('doc_id') or doc.get('document_id')
-            if doc_id:
-                normalized.add(str(doc_id))
-            else:
-                text = doc.get('text') or doc.get('content') or doc.get('page_content')
-                if text:
-                    normalized.add(str(text)[:200])
-        else:
-            normalized.add(str(doc))
-    return normalized
 
+def calculate_hit_rate_pre(retrieved_list: List[str], gt_set: FrozenSet[str]) -> float:
+    """
+    Calculate Hit Rate from normalized documents.
+    
+    Args:
+        retrieved_list: Normalized retrieved document keys
+        gt_set: Normalized ground truth document keys
+        
+    Returns:
+        1.0 if at least one relevant document retrieved, 0.0 otherwise
+    """
+    # Check if any overlap exists (stops at the first shared document)
+    has_hit = not gt_set.isdisjoint(retrieved_list)
+    return 1.0 if has_hit else 0.0
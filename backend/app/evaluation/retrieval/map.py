@@ -4,7 +4,8 @@ Mean Average Precision (MAP): Average of precision values at each relevant docum
 Formula: MAP = (1 / # relevant docs) * Σ(Precision@k * relevance@k)
 where k is the rank and relevance@k is 1 if doc at k is relevant, 0 otherwise
 """
-from typing import List, Any
+from typing import List, Any, FrozenSet
+from ._normalize import normalize_docs_list, normalize_docs_set
 
 
 def calculate_map(
@@ -25,18 +26,44 @@ def calculate_map(
         return 0.0
     
     # Normalize documents
-    gt_set = _normalize_docs_set(ground_truth_docs)
-    retrieved_list = _normalize_docs_list(retrieved_docs)
+    return calculate_map_pre(
+        normalize_docs_list(retrieved_docs),
+        normalize_docs_set(ground_truth_docs)
+    )
+
+
+def calculate_map_pre(retrieved_list: List[str], gt_set: FrozenSet[str]) -> float:
+    """
+    Calculate Mean Average Precision from normalized documents.
+    
+    Args:
+        retrieved_list: Normalized retrieved document keys (in ranked order)
+        gt_set: Normalized ground truth document keys
+        
+    Returns:
+        MAP score between 0 and 1
+    """
+    # No relevant document at all (the common case) is settled in one C-level pass
+    if gt_set.isdisjoint(retrieved_list):
+        return 0.0
     
     # Calculate average precision
     precision_sum = 0.0
     num_relevant_found = 0
+    gt_len = len(gt_set)
+    found = set()
     
     for rank, doc in enumerate(retrieved_list, start=1):
-        if doc in gt_set:
+        # Repeats of an already found document (e.g. several chunks of it) are not relevant again
+        if doc in gt_set and doc not in found:
+            found.add(doc)
             num_relevant_found += 1
             precision_at_k = num_relevant_found / rank
             precision_sum += precision_at_k
+            
+            # Every relevant document found, later ranks cannot add precision
+            if num_relevant_found == gt_len:
+                break
     
     if num_relevant_found == 0:
         return 0.0
@@ -44,42 +71,3 @@ def calculate_map(
     # Average over all relevant documents (not just found ones)
     average_precision = precision_sum / len(gt_set)
     return round(average_precision, 4)
-
-
-def _normalize_docs_set(docs: List[Any]) -> set:
-    """Normalize documents to set for comparison"""
-    normalized = set()
-    for doc in docs:
-        if isinstance(doc, str):
-            normalized.add(doc)
-        elif isinstance(doc, dict):
-            doc_id = doc.get('id') or doc.get('doc_id') or doc.get('document_id')
-            if doc_id:
-                normalized.add(str(doc_id))
-            else:
-                text = doc.get('text') or doc.get('content') or doc.get('page_content')
-                if text:
-                    normalized.add(str(text)[:200])
-        else:
-            normalized.add(str(doc))
-    return normalized
-
-
-def _normalize_docs_list(docs: List[Any]) -> list:
-    """Normalize documents to list (preserving order)"""
-    normalized = []
-    for doc in docs:
-        if isinstance(doc, str):
-            normalized.append(doc)
-        elif isinstance(doc, dict):
-            doc_id = doc.get('id') or doc.get('doc_id') or doc.get('document_id')
-            if doc_id:
-                normalized.append(str(doc_id))
-            else:
-                text = doc.get('text') or doc.get('content') or doc.get('page_content')
-                if text:
-                    normalized.append(str(text)[:200])
-        else:
-            normalized.append(str(doc))
-    return normalized
-
@@ -4,7 +4,8 @@ Mean Reciprocal Rank (MRR): Average of reciprocal ranks of first relevant docume
 Formula: MRR = 1 / rank_of_first_relevant_doc
 (For single query, mean is taken across multiple queries in practice)
 """
-from typing import List, Any, Optional
+from typing import List, Any, FrozenSet
+from ._normalize import normalize_docs_list, normalize_docs_set
 
 
 def calculate_mrr(
@@ -25,51 +26,47 @@ def calculate_mrr(
         return 0.0
     
     # Normalize documents
-    gt_set = _normalize_docs_set(ground_truth_docs)
-    retrieved_list = _normalize_docs_list(retrieved_docs)
-    
-    # Find rank of first relevant document (1-indexed)
-    for rank, doc in enumerate(retrieved_list, start=1):
-        if doc in gt_set:
-            return round(1.0 / rank, 4)
-    
-    return 0.0
-
+    return calculate_mrr_pre(
+        normalize_docs_list(retrieved_docs),
+        normalize_docs_set(ground_truth_docs)
+    )
 
-def _normalize_docs_set(docs: List[Any]) -> set:
-    """Normalize documents to set for comparison"""
-    normalized = set()
-    for doc in docs:
-        if isinstance(doc, str):
-            normalized.add(doc)
-        elif isinstance(doc, dict):
-            doc_id = doc.get('id') or doc.get('doc_id') or doc.get('document_id')
-            if doc_id:
-                normalized.add(str(doc_id))
-            else:
-                text = doc.get('text') or doc.get('content') or doc.get('page_content')
-                if text:
-                    normalized.add(str(text)[:200])
-        else:
-            normalized.add(str(doc))
-    return normalized
 
+def calculate_mrr_pre(retrieved_list: List[str], gt_set: FrozenSet[str]) -> float:
+    """
+    Calculate the reciprocal rank from normalized documents.
+    
+    Args:
+        retrieved_list: Normalized retrieved document keys (in ranked order)
+        gt_set: Normalized ground truth document keys
+        
+    Returns:
+        Reciprocal rank (1/rank) of first relevant document, or 0 if none found
+    """
+    rank = find_first_relevant_rank(retrieved_list, gt_set)
+    return round(1.0 / rank, 4) if rank else 0.0
 
-def _normalize_docs_list(docs: List[Any]) -> list:
-    """Normalize documents to list (preserving order)"""
-    normalized = []
-    for doc in docs:
-        if isinstance(doc, str):
-            normalized.append(doc)
-        elif isinstance(doc, dict):
-            doc_id = doc.get('id') or doc.get('doc_id') or doc.get('document_id')
-            if doc_id:
-                normalized.append(str(doc_id))
-            else:
-                text = doc.get('text') or doc.get('content') or doc.get('page_content')
-                if text:
-                    normalized.append(str(text)[:200])
-        else:
-            normalized.append(str(doc))
-    return normalized
 
+def find_first_relevant_rank(retrieved_list: List[str], gt_set: FrozenSet[str]) -> int:
+    """
+    Find the rank of the first relevant document.
+    
+    Callers averaging MRR over many queries can keep the integer ranks and
+    take the reciprocals once, instead of averaging rounded per-query values.
+    
+    Args:
+        retrieved_list: Normalized retrieved document keys (in ranked order)
+        gt_set: Normalized ground truth document keys
+        
+    Returns:
+        1-indexed rank of the first relevant document, or 0 if none found
+    """
+    # No relevant document at all (the common case) is settled in one C-level pass
+    if gt_set.isdisjoint(retrieved_list):
+        return 0
+    
+    for rank, doc in enumerate(retrieved_list, start=1):
+        if doc in gt_set:
+            return rank
+    
+    return 0
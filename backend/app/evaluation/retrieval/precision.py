@@ -3,13 +3,14 @@ Precision@K: Fraction of retrieved documents that are relevant
 
 Formula: Precision@K = (# relevant docs in top K) / K
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, FrozenSet, Sequence
+from ._normalize import DEFAULT_K_VALUES, normalize_docs_list, normalize_docs_set, relevant_counts
 
 
 def calculate_precision_at_k(
     retrieved_docs: List[Any],
     ground_truth_docs: List[Any],
-    k_values: List[int] = [1, 3, 5, 10]
+    k_values: Sequence[int] = DEFAULT_K_VALUES
 ) -> Dict[int, float]:
     """
     Calculate Precision@K for multiple K values.
@@ -29,41 +30,41 @@ def calculate_precision_at_k(
         return {k: 0.0 for k in k_values}
     
     # Normalize documents for comparison
-    gt_set = _normalize_docs(ground_truth_docs)
-    retrieved_list = _normalize_docs(retrieved_docs)
+    return calculate_precision_at_k_pre(
+        normalize_docs_list(retrieved_docs),
+        normalize_docs_set(ground_truth_docs),
+        k_values
+    )
+
+
+def calculate_precision_at_k_pre(
+    retrieved_list: List[str],
+    gt_set: FrozenSet[str],
+    k_values: Sequence[int] = DEFAULT_K_VALUES
+) -> Dict[int, float]:
+    """
+    Calculate Precision@K from normalized documents.
+    
+    Args:
+        retrieved_list: Normalized retrieved document keys (in ranked order)
+        gt_set: Normalized ground truth document keys
+        k_values: List of K values to compute precision for
+        
+    Returns:
+        Dictionary mapping K to Precision@K score
+    """
+    # One pass over the top ranks serves every K
+    counts = relevant_counts(retrieved_list, gt_set, max(k_values, default=0))
     
     results = {}
     for k in k_values:
-        top_k = retrieved_list[:k]
-        if not top_k:
+        top_len = min(k, len(counts))
+        if top_len <= 0:
             results[k] = 0.0
             continue
             
-        relevant_retrieved = len(set(top_k) & gt_set)
-        precision = relevant_retrieved / len(top_k)
+        relevant_retrieved = counts[top_len - 1]
+        precision = relevant_retrieved / top_len
         results[k] = round(precision, 4)
     
     return results
-
-
-def _normalize_docs(docs: List[Any]) -> list:
-    """
-    Normalize documents to comparable format (preserving order for retrieved).
-    """
-    normalized = []
-    for doc in docs:
-        if isinstance(doc, str):
-            normalized.append(doc)
-        elif isinstance(doc, dict):
-            doc_id = doc.get('id') or doc.get('doc_id') or doc.get('document_id')
-            if doc_id:
-                normalized.append(str(doc_id))
-            else:
-                text = doc.get('text') or doc.get('content') or doc.get('page_content')
-                if text:
-                    normalized.append(str(text)[:200])
-        else:
-            normalized.append(str(doc))
-    
-    return normalized
-
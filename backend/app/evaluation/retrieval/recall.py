@@ -3,13 +3,14 @@ Recall@K: Fraction of relevant documents retrieved in top K results
 
 Formula: Recall@K = (# relevant docs in top K) / (total # relevant docs)
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, FrozenSet, Sequence
+from ._normalize import DEFAULT_K_VALUES, normalize_docs_list, normalize_docs_set, relevant_counts
 
 
 def calculate_recall_at_k(
     retrieved_docs: List[Any],
     ground_truth_docs: List[Any],
-    k_values: List[int] = [1, 3, 5, 10]
+    k_values: Sequence[int] = DEFAULT_K_VALUES
 ) -> Dict[int, float]:
     """
     Calculate Recall@K for multiple K values.
@@ -35,41 +36,40 @@ def calculate_recall_at_k(
         return {k: 0.0 for k in k_values}
     
     # Normalize documents for comparison
-    gt_set = _normalize_docs(ground_truth_docs)
-    retrieved_list = _normalize_docs(retrieved_docs)
+    return calculate_recall_at_k_pre(
+        normalize_docs_list(retrieved_docs),
+        normalize_docs_set(ground_truth_docs),
+        k_values
+    )
+
+
+def calculate_recall_at_k_pre(
+    retrieved_list: List[str],
+    gt_set: FrozenSet[str],
+    k_values: Sequence[int] = DEFAULT_K_VALUES
+) -> Dict[int, float]:
+    """
+    Calculate Recall@K from normalized documents.
+    
+    Args:
+        retrieved_list: Normalized retrieved document keys (in ranked order)
+        gt_set: Normalized ground truth document keys
+        k_values: List of K values to compute recall for
+        
+    Returns:
+        Dictionary mapping K to Recall@K score
+    """
+    if not gt_set or not retrieved_list:
+        return {k: 0.0 for k in k_values}
+    
+    # One pass over the top ranks serves every K
+    counts = relevant_counts(retrieved_list, gt_set, max(k_values, default=0))
     
     results = {}
     for k in k_values:
-        top_k = retrieved_list[:k]
-        relevant_retrieved = len(set(top_k) & gt_set)
+        top_len = min(k, len(counts))
+        relevant_retrieved = counts[top_len - 1] if top_len > 0 else 0
         recall = relevant_retrieved / len(gt_set)
         results[k] = round(recall, 4)
     
     return results
-
-
-def _normalize_docs(docs: List[Any]) -> set:
-    """
-    Normalize documents to comparable format.
-    Handles strings, dicts with 'id'/'doc_id', or full documents.
-    """
-    normalized = set()
-    for doc in docs:
-        if isinstance(doc, str):
-            normalized.add(doc)
-        elif isinstance(doc, dict):
-            # Try to extract ID
-            doc_id = doc.get('id') or doc.get('doc_id') or doc.get('document_id')
-            if doc_id:
-                normalized.add(str(doc_id))
-            else:
-                # Use text content as fallback
-                text = doc.get('text') or doc.get('content') or doc.get('page_content')
-                if text:
-                    normalized.add(str(text)[:200])  # Use first 200 chars as ID
-        else:
-            # Fallback: convert to string
-            normalized.add(str(doc))
-    
-    return normalized
-
@@ -3,14 +3,20 @@ Evaluation Runner: Orchestrates the entire evaluation process
 
 Runs retrieval, generation, and hallucination metrics for a single query.
 """
-from typing import List, Any, Dict, Optional
+import asyncio
+import math
+from functools import lru_cache
+from typing import List, Any, Dict, Optional, Tuple
 from .retrieval import (
-    calculate_recall_at_k,
-    calculate_precision_at_k,
-    calculate_mrr,
-    calculate_map,
-    calculate_hit_rate,
-    calculate_coverage
+    calculate_recall_at_k_pre,
+    calculate_precision_at_k_pre,
+    find_first_relevant_rank,
+    calculate_map_pre,
+    calculate_hit_rate_pre,
+    calculate_coverage_pre,
+    normalize_docs_list,
+    normalize_docs_set,
+    DEFAULT_K_VALUES
 )
 from .generation import (
     calculate_faithfulness,
@@ -22,10 +28,13 @@ from .generation import (
 )
 from .hallucination import (
     detect_hallucination_llm,
+    detect_hallucination_llm_async,
     check_citations,
     calculate_embedding_drift,
     aggregate_hallucination_score
 )
+from .hallucination._context import ContextBundle, build_context
+from ._embed_cache import embed_cached
 from ..core.logging import log
 from ..core.config import settings
 
@@ -50,7 +59,8 @@ class EvaluationRunner:
         retrieved_docs: List[Any],
         generated_answer: str,
         ground_truth_docs: Optional[List[Any]] = None,
-        ground_truth_answer: Optional[str] = None
+        ground_truth_answer: Optional[str] = None,
+        ground_truth_index: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Evaluate a single query-answer pair.
@@ -61,10 +71,112 @@ class EvaluationRunner:
             generated_answer: Answer generated by RAG system
             ground_truth_docs: Ground truth relevant documents
             ground_truth_answer: Ground truth answer (optional)
+            ground_truth_index: Precomputed ground truth keys (normalized here if missing)
             
         Returns:
             Dictionary with all evaluation metrics
         """
+        results, ctx, embeddings = self._evaluate_metrics(
+            query, retrieved_docs, generated_answer, ground_truth_docs, ground_truth_answer,
+            ground_truth_index
+        )
+        
+        self._detect_hallucination(results, generated_answer, retrieved_docs, ctx, embeddings)
+        
+        log.info("Evaluation completed successfully")
+        return results
+    
+    async def evaluate_single_async(
+        self,
+        query: str,
+        retrieved_docs: List[Any],
+        generated_answer: str,
+        ground_truth_docs: Optional[List[Any]] = None,
+        ground_truth_answer: Optional[str] = None,
+        ground_truth_index: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a single query-answer pair without blocking the event loop.
+        
+        Same results as evaluate_single. CPU-bound metrics run in worker
+        threads, and the three hallucination signals (LLM judge, citation
+        check, embedding drift) run concurrently, so the LLM request no
+        longer adds to the time of the other two.
+        
+        Args:
+            query: The user query
+            retrieved_docs: Documents retrieved by RAG system
+            generated_answer: Answer generated by RAG system
+            ground_truth_docs: Ground truth relevant documents
+            ground_truth_answer: Ground truth answer (optional)
+            ground_truth_index: Precomputed ground truth keys (normalized here if missing)
+            
+        Returns:
+            Dictionary with all evaluation metrics
+        """
+        results, ctx, embeddings = await asyncio.to_thread(
+            self._evaluate_metrics,
+            query, retrieved_docs, generated_answer, ground_truth_docs, ground_truth_answer,
+            ground_truth_index
+        )
+        
+        if not retrieved_docs:
+            # Without retrieved context every hallucination check returns a
+            # constant right away (no LLM call), skip the worker threads
+            self._detect_hallucination(results, generated_answer, retrieved_docs, ctx, embeddings)
+            log.info("Evaluation completed successfully")
+            return results
+        
+        # === HALLUCINATION DETECTION ===
+        if self.openai_api_key:
+            llm_judge_task = detect_hallucination_llm_async(
+                generated_answer, retrieved_docs, self.openai_api_key, ctx=ctx
+            )
+        else:
+            # Rule-based fallback only, keep it off the event loop
+            llm_judge_task = asyncio.to_thread(
+                detect_hallucination_llm, generated_answer, retrieved_docs, None, ctx=ctx
+            )
+        
+        try:
+            llm_judge, citation_check, drift = await asyncio.gather(
+                llm_judge_task,
+                asyncio.to_thread(check_citations, generated_answer, retrieved_docs, ctx=ctx),
+                asyncio.to_thread(
+                    calculate_embedding_drift,
+                    generated_answer, retrieved_docs, self.embedding_model,
+                    answer_emb=embeddings.get("answer"),
+                    context_embs=embeddings.get("context"),
+                    ctx=ctx
+                )
+            )
+            
+            results["citation_coverage"] = citation_check["citation_coverage"]
+            self._add_hallucination_score(results, llm_judge, citation_check, drift)
+            log.debug("Hallucination detection completed")
+        except Exception as e:
+            log.error(f"Error in hallucination detection: {e}")
+            results["hallucination_error"] = str(e)
+        
+        log.info("Evaluation completed successfully")
+        return results
+    
+    def _evaluate_metrics(
+        self,
+        query: str,
+        retrieved_docs: List[Any],
+        generated_answer: str,
+        ground_truth_docs: Optional[List[Any]],
+        ground_truth_answer: Optional[str],
+        ground_truth_index: Optional[List[str]]
+    ) -> Tuple[Dict[str, Any], ContextBundle, Dict[str, Any]]:
+        """
+        Run the retrieval, generation and similarity metrics.
+        
+        Returns:
+            Results so far, the prepared context and the precomputed embeddings,
+            which the hallucination checks reuse
+        """
         log.info(f"Evaluating query: {query[:50]}...")
         
         results = {
@@ -73,15 +185,31 @@ class EvaluationRunner:
             "generated_answer": generated_answer
         }
         
+        # Prepare the retrieved context once for every metric
+        ctx = build_context(retrieved_docs or [])
+        
+        # Encode every text the embedding metrics need in one batch
+        embeddings = self._encode_inputs(query, generated_answer, ground_truth_answer, ctx.texts)
+        
         # === RETRIEVAL METRICS ===
         if ground_truth_docs:
             try:
-                results["recall_at_k"] = calculate_recall_at_k(retrieved_docs, ground_truth_docs)
-                results["precision_at_k"] = calculate_precision_at_k(retrieved_docs, ground_truth_docs)
-                results["mrr"] = calculate_mrr(retrieved_docs, ground_truth_docs)
-                results["map_score"] = calculate_map(retrieved_docs, ground_truth_docs)
-                results["hit_rate"] = calculate_hit_rate(retrieved_docs, ground_truth_docs)
-                results["coverage"] = calculate_coverage(retrieved_docs, ground_truth_docs)
+                # Normalize once and share the keys across all retrieval metrics
+                retrieved_list = normalize_docs_list(retrieved_docs or [])
+                if ground_truth_index is not None:
+                    gt_set = frozenset(ground_truth_index)
+                else:
+                    gt_set = normalize_docs_set(ground_truth_docs)
+                
+                results["recall_at_k"] = calculate_recall_at_k_pre(retrieved_list, gt_set)
+                results["precision_at_k"] = calculate_precision_at_k_pre(retrieved_list, gt_set)
+                # Rank kept so run-level MRR is averaged from exact reciprocals
+                first_rank = find_first_relevant_rank(retrieved_list, gt_set)
+                results["first_relevant_rank"] = first_rank
+                results["mrr"] = round(1.0 / first_rank, 4) if first_rank else 0.0
+                results["map_score"] = calculate_map_pre(retrieved_list, gt_set)
+                results["hit_rate"] = calculate_hit_rate_pre(retrieved_list, gt_set)
+                results["coverage"] = calculate_coverage_pre(retrieved_list, gt_set)
                 log.debug("Retrieval metrics calculated")
             except Exception as e:
                 log.error(f"Error calculating retrieval metrics: {e}")
@@ -93,14 +221,17 @@ class EvaluationRunner:
         try:
             # Faithfulness
             faithfulness_result = calculate_faithfulness(
-                generated_answer, retrieved_docs, self.embedding_model
+                generated_answer, retrieved_docs, self.embedding_model,
+                context_embs=embeddings.get("context")
             )
             results["faithfulness"] = faithfulness_result["score"]
             results["faithfulness_detail"] = faithfulness_result
             
             # Answer relevance
             relevance_result = calculate_answer_relevance(
-                query, generated_answer, self.embedding_model
+                query, generated_answer, self.embedding_model,
+                query_emb=embeddings.get("query"),
+                answer_emb=embeddings.get("answer")
             )
             results["answer_relevance"] = relevance_result["score"]
             results["answer_relevance_detail"] = relevance_result
@@ -121,7 +252,9 @@ class EvaluationRunner:
         if ground_truth_answer:
             try:
                 sim_result = calculate_semantic_similarity(
-                    generated_answer, ground_truth_answer, self.embedding_model
+                    generated_answer, ground_truth_answer, self.embedding_model,
+                    answer_emb=embeddings.get("answer"),
+                    ground_truth_emb=embeddings.get("ground_truth")
                 )
                 results["semantic_similarity"] = sim_result["score"]
                 results["semantic_similarity_detail"] = sim_result
@@ -135,38 +268,95 @@ class EvaluationRunner:
                 log.error(f"Error calculating similarity metrics: {e}")
                 results["similarity_error"] = str(e)
         
+        return results, ctx, embeddings
+    
+    def _detect_hallucination(
+        self,
+        results: Dict[str, Any],
+        generated_answer: str,
+        retrieved_docs: List[Any],
+        ctx: ContextBundle,
+        embeddings: Dict[str, Any]
+    ) -> None:
+        """Run the hallucination checks one after another and add their results"""
         # === HALLUCINATION DETECTION ===
         try:
             # LLM Judge
             llm_judge = detect_hallucination_llm(
-                generated_answer, retrieved_docs, self.openai_api_key
+                generated_answer, retrieved_docs, self.openai_api_key, ctx=ctx
             )
             
             # Citation Check
-            citation_check = check_citations(generated_answer, retrieved_docs)
+            citation_check = check_citations(generated_answer, retrieved_docs, ctx=ctx)
             results["citation_coverage"] = citation_check["citation_coverage"]
             
             # Embedding Drift
             drift = calculate_embedding_drift(
-                generated_answer, retrieved_docs, self.embedding_model
-            )
-            
-            # Aggregate hallucination score
-            hallucination_aggregate = aggregate_hallucination_score(
-                llm_judge, citation_check, drift
+                generated_answer, retrieved_docs, self.embedding_model,
+                answer_emb=embeddings.get("answer"),
+                context_embs=embeddings.get("context"),
+                ctx=ctx
             )
             
-            results["hallucination_score"] = hallucination_aggregate["hallucination_score"]
-            results["hallucinated_spans"] = hallucination_aggregate["hallucinated_spans"]
-            results["hallucination_detail"] = hallucination_aggregate
-            
+            self._add_hallucination_score(results, llm_judge, citation_check, drift)
             log.debug("Hallucination detection completed")
         except Exception as e:
             log.error(f"Error in hallucination detection: {e}")
             results["hallucination_error"] = str(e)
+    
+    def _add_hallucination_score(
+        self,
+        results: Dict[str, Any],
+        llm_judge: Dict[str, Any],
+        citation_check: Dict[str, Any],
+        drift: Dict[str, Any]
+    ) -> None:
+        """Aggregate the hallucination signals into results"""
+        hallucination_aggregate = aggregate_hallucination_score(
+            llm_judge, citation_check, drift
+        )
         
-        log.info("Evaluation completed successfully")
-        return results
+        results["hallucination_score"] = hallucination_aggregate["hallucination_score"]
+        results["hallucinated_spans"] = hallucination_aggregate["hallucinated_spans"]
+        results["hallucination_detail"] = hallucination_aggregate
+    
+    def _encode_inputs(
+        self,
+        query: str,
+        generated_answer: str,
+        ground_truth_answer: Optional[str],
+        context_texts: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Encode the query, answer, ground truth answer and contexts in a single batch.
+        Texts already in the embedding cache are not encoded again.
+        
+        Returns:
+            Dict with L2-normalized "query", "answer", "ground_truth" and
+            "context" embeddings (numpy); empty if there is no model or
+            encoding fails, in which case each metric encodes what it needs itself
+        """
+        if self.embedding_model is None or not query or not generated_answer:
+            return {}
+        
+        texts = [query, generated_answer]
+        if ground_truth_answer:
+            texts.append(ground_truth_answer)
+        context_start = len(texts)
+        texts.extend(context_texts)
+        
+        try:
+            embs = embed_cached(self.embedding_model, texts)
+        except Exception as e:
+            log.warning(f"Batch encoding failed: {e}")
+            return {}
+        
+        embeddings = {"query": embs[0], "answer": embs[1]}
+        if ground_truth_answer:
+            embeddings["ground_truth"] = embs[2]
+        if context_texts:
+            embeddings["context"] = embs[context_start:]
+        return embeddings
     
     def calculate_aggregate_metrics(self, results_list: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -178,57 +368,134 @@ class EvaluationRunner:
         Returns:
             Dictionary with aggregated metrics
         """
-        if not results_list:
+        aggregator = MetricsAggregator()
+        for result in results_list:
+            aggregator.update(result)
+        return aggregator.finalize()
+
+
+# Metrics aggregated as avg/min/max (Recall@K and Precision@K only as avg, per K)
+AGGREGATED_METRICS = (
+    "mrr", "map_score", "hit_rate", "coverage",
+    "faithfulness", "answer_relevance", "context_utilization",
+    "semantic_similarity", "rouge_l", "f1_score",
+    "hallucination_score", "citation_coverage"
+)
+
+
+class MetricsAggregator:
+    """
+    Running aggregate of evaluation results.
+    
+    Results are folded in one at a time, so a run doesn't have to keep them
+    all in memory. Sums are kept exactly, which makes the averages
+    independent of the order results arrive in.
+    """
+    __slots__ = ("total", "hallucination_count", "_stats")
+    
+    def __init__(self):
+        self.total = 0
+        self.hallucination_count = 0
+        # Metric -> [count, exact partial sums, min, max]
+        self._stats: Dict[str, list] = {}
+    
+    def update(self, result: Dict[str, Any]) -> None:
+        """Add one evaluation result"""
+        self.total += 1
+        
+        for field, name in (("recall_at_k", "recall_at"), ("precision_at_k", "precision_at")):
+            values = result.get(field)
+            if not values:
+                continue
+            for k in DEFAULT_K_VALUES:
+                value = values.get(k)
+                if value is not None:
+                    self._add(f"{name}_{k}", value)
+        
+        for metric in AGGREGATED_METRICS:
+            if result.get(metric) is not None:
+                self._add(metric, _reciprocal_rank(result) if metric == "mrr" else result[metric])
+        
+        if result.get("hallucination_score", 0) > 0.5:
+            self.hallucination_count += 1
+    
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Aggregate metrics of the results added so far.
+        
+        Returns:
+            Dictionary with aggregated metrics (empty if there were no results)
+        """
+        if not self.total:
             return {}
         
         aggregates = {}
         
-        # Define metrics to aggregate
-        numeric_metrics = [
-            "mrr", "map_score", "hit_rate", "coverage",
-            "faithfulness", "answer_relevance", "context_utilization",
-            "semantic_similarity", "rouge_l", "f1_score",
-            "hallucination_score", "citation_coverage"
-        ]
-        
-        # Recall@K and Precision@K need special handling
-        k_values = [1, 3, 5, 10]
-        for k in k_values:
-            recall_vals = [r.get("recall_at_k", {}).get(k) for r in results_list if r.get("recall_at_k")]
-            recall_vals = [v for v in recall_vals if v is not None]
-            if recall_vals:
-                aggregates[f"avg_recall_at_{k}"] = round(sum(recall_vals) / len(recall_vals), 4)
-            
-            precision_vals = [r.get("precision_at_k", {}).get(k) for r in results_list if r.get("precision_at_k")]
-            precision_vals = [v for v in precision_vals if v is not None]
-            if precision_vals:
-                aggregates[f"avg_precision_at_{k}"] = round(sum(precision_vals) / len(precision_vals), 4)
-        
-        # Average other metrics
-        for metric in numeric_metrics:
-            values = [r.get(metric) for r in results_list if r.get(metric) is not None]
-            if values:
-                aggregates[f"avg_{metric}"] = round(sum(values) / len(values), 4)
-                aggregates[f"min_{metric}"] = round(min(values), 4)
-                aggregates[f"max_{metric}"] = round(max(values), 4)
-        
-        # Count queries with hallucinations
-        hallucination_count = sum(
-            1 for r in results_list 
-            if r.get("hallucination_score", 0) > 0.5
-        )
-        aggregates["queries_with_hallucinations"] = hallucination_count
-        aggregates["hallucination_rate"] = round(hallucination_count / len(results_list), 4)
+        for k in DEFAULT_K_VALUES:
+            for name in ("recall_at", "precision_at"):
+                stats = self._stats.get(f"{name}_{k}")
+                if stats:
+                    aggregates[f"avg_{name}_{k}"] = round(math.fsum(stats[1]) / stats[0], 4)
+        
+        for metric in AGGREGATED_METRICS:
+            stats = self._stats.get(metric)
+            if stats:
+                count, partials, lowest, highest = stats
+                aggregates[f"avg_{metric}"] = round(math.fsum(partials) / count, 4)
+                aggregates[f"min_{metric}"] = round(lowest, 4)
+                aggregates[f"max_{metric}"] = round(highest, 4)
+        
+        aggregates["queries_with_hallucinations"] = self.hallucination_count
+        aggregates["hallucination_rate"] = round(self.hallucination_count / self.total, 4)
         
-        aggregates["total_queries"] = len(results_list)
+        aggregates["total_queries"] = self.total
         
         return aggregates
+    
+    def _add(self, metric: str, value: float) -> None:
+        stats = self._stats.get(metric)
+        if stats is None:
+            self._stats[metric] = [1, [value], value, value]
+            return
+        
+        stats[0] += 1
+        _add_exact(stats[1], value)
+        if value < stats[2]:
+            stats[2] = value
+        if value > stats[3]:
+            stats[3] = value
+
+
+def _add_exact(partials: List[float], value: float) -> None:
+    """Add a value to a list of non-overlapping partial sums without rounding error (Shewchuk)"""
+    i = 0
+    for partial in partials:
+        if abs(value) < abs(partial):
+            value, partial = partial, value
+        high = value + partial
+        low = partial - (high - value)
+        if low:
+            partials[i] = low
+            i += 1
+        value = high
+    partials[i:] = [value]
+
+
+def _reciprocal_rank(result: Dict[str, Any]) -> float:
+    """Unrounded reciprocal rank of a result, or its stored MRR if the rank is missing"""
+    rank = result.get("first_relevant_rank")
+    if rank is None:
+        return result["mrr"]
+    return 1.0 / rank if rank else 0.0
 
 
 def load_embedding_model(model_name: Optional[str] = None):
     """
     Load sentence transformer embedding model.
     
+    The model is loaded once per process and shared by every run. A failed
+    load is not cached, the next call tries again.
+    
     Args:
         model_name: Name of the model to load
         
@@ -236,15 +503,17 @@ def load_embedding_model(model_name: Optional[str] = None):
         Loaded SentenceTransformer model or None
     """
     try:
-        from sentence_transformers import SentenceTransformer
-        
-        model_name = model_name or settings.DEFAULT_EMBEDDING_MODEL
-        log.info(f"Loading embedding model: {model_name}")
-        
-        model = SentenceTransformer(model_name)
-        log.info("Embedding model loaded successfully")
-        return model
+        return _load_sentence_transformer(model_name or settings.DEFAULT_EMBEDDING_MODEL)
     except Exception as e:
         log.error(f"Failed to load embedding model: {e}")
         return None
 
+
+@lru_cache(maxsize=1)
+def _load_sentence_transformer(model_name: str):
+    from sentence_transformers import SentenceTransformer
+    
+    log.info(f"Loading embedding model: {model_name}")
+    model = SentenceTransformer(model_name)
+    log.info("Embedding model loaded successfully")
+    return model
@@ -1,11 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 
 from .core.config import settings
 from .core.logging import log
 from .api.routes import datasets, evaluations, versions
 from .db.session import engine, Base
+from .services import evaluation_worker
+from .evaluation.runner import load_embedding_model
+from .rag.pipelines import open_http_client, close_http_client
 
 
 @asynccontextmanager
@@ -16,9 +21,19 @@ async def lifespan(app: FastAPI):
         await conn.run_sync(Base.metadata.create_all)
     
     log.info("Database initialized")
+    
+    # Load the shared embedding model before the first run needs it
+    await asyncio.to_thread(load_embedding_model)
+    
+    # One pooled RAG API client for every evaluation run
+    app.state.http = open_http_client()
+    
+    await evaluation_worker.start_workers()
     yield
     
     log.info("Shutting down EvRAG API server")
+    await evaluation_worker.stop_workers()
+    await close_http_client()
 
 
 app = FastAPI(
@@ -36,6 +51,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def limit_request_size(request: Request, call_next):
+    """Reject oversized bodies before they are read"""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_UPLOAD_BYTES:
+        return JSONResponse(status_code=413, content={"detail": "Request body too large"})
+    return await call_next(request)
+
+
 app.include_router(datasets.router, prefix="/api")
 app.include_router(evaluations.router, prefix="/api")
 app.include_router(versions.router, prefix="/api")
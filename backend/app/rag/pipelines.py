@@ -3,10 +3,52 @@ RAG Pipeline Interface
 
 Provides interface for calling RAG systems (API or local).
 """
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import json
 import httpx
+from ..core.config import settings
+from ..core.serialization import json_loads
 from ..core.logging import log
 
+try:
+    import h2
+except ImportError:  # h2 is optional, the client then speaks HTTP/1.1
+    h2 = None
+
+# Responses by (endpoint, query, config digest), shared by all pipelines of the process
+_response_cache: "OrderedDict[Tuple[str, str, bytes], Dict[str, Any]]" = OrderedDict()
+
+# Process-wide client opened by the app lifespan, shared by all API pipelines
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _new_http_client(max_keepalive: int, max_connections: Optional[int] = None) -> httpx.AsyncClient:
+    """Pooled HTTP client for RAG API calls"""
+    return httpx.AsyncClient(
+        timeout=30.0,
+        http2=h2 is not None,
+        limits=httpx.Limits(max_keepalive_connections=max_keepalive, max_connections=max_connections)
+    )
+
+
+def open_http_client() -> httpx.AsyncClient:
+    """Create the shared RAG API client"""
+    global _http_client
+    
+    _http_client = _new_http_client(max_keepalive=128, max_connections=256)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared RAG API client"""
+    global _http_client
+    
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class RAGPipeline:
     """Base interface for RAG pipelines"""
@@ -23,20 +65,34 @@ class RAGPipeline:
             Dict with 'retrieved_docs' and 'generated_answer'
         """
         raise NotImplementedError
+    
+    async def aclose(self) -> None:
+        """Release connections held by the pipeline"""
+        pass
 
 
 class APIRAGPipeline(RAGPipeline):
     """RAG Pipeline that calls an external API"""
     
-    def __init__(self, endpoint: str):
+    def __init__(self, endpoint: str, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize API-based RAG pipeline.
         
         Args:
             endpoint: API endpoint URL
+            client: Shared HTTP client (the pipeline opens and owns its own if missing)
         """
         self.endpoint = endpoint
         
+        # One pooled client for all queries of the pipeline
+        self._owns_client = client is None
+        self._client = client if client is not None else _new_http_client(max_keepalive=64)
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client if the pipeline owns it"""
+        if self._owns_client:
+            await self._client.aclose()
+        
     async def query(self, query_text: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Query RAG API endpoint.
@@ -50,28 +106,35 @@ class APIRAGPipeline(RAGPipeline):
         """
         config = config or {}
         
+        cache_key = None
+        if settings.RAG_RESPONSE_CACHE_SIZE > 0:
+            cache_key = (self.endpoint, query_text, _config_digest(config))
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                _response_cache.move_to_end(cache_key)
+                return cached
+        
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                payload = {
-                    "query": query_text,
-                    **config
-                }
-                
-                log.debug(f"Calling RAG API: {self.endpoint}")
-                response = await client.post(self.endpoint, json=payload)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Validate response
-                if "retrieved_docs" not in data or "generated_answer" not in data:
-                    raise ValueError("Invalid API response format. Expected 'retrieved_docs' and 'generated_answer'")
-                
-                return {
-                    "retrieved_docs": data["retrieved_docs"],
-                    "generated_answer": data["generated_answer"],
-                    "metadata": data.get("metadata", {})
-                }
+            payload = {
+                "query": query_text,
+                **config
+            }
+            
+            log.debug(f"Calling RAG API: {self.endpoint}")
+            response = await self._client.post(self.endpoint, json=payload)
+            response.raise_for_status()
+            
+            data = json_loads(response.content)
+            
+            # Validate response
+            if "retrieved_docs" not in data or "generated_answer" not in data:
+                raise ValueError("Invalid API response format. Expected 'retrieved_docs' and 'generated_answer'")
+            
+            result = {
+                "retrieved_docs": data["retrieved_docs"],
+                "generated_answer": data["generated_answer"],
+                "metadata": data.get("metadata", {})
+            }
                 
         except httpx.HTTPError as e:
             log.error(f"HTTP error calling RAG API: {e}")
@@ -79,6 +142,13 @@ class APIRAGPipeline(RAGPipeline):
         except Exception as e:
             log.error(f"Error querying RAG pipeline: {e}")
             raise
+        
+        if cache_key is not None:
+            _response_cache[cache_key] = result
+            while len(_response_cache) > settings.RAG_RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+        
+        return result
 
 
 class MockRAGPipeline(RAGPipeline):
@@ -103,6 +173,12 @@ class MockRAGPipeline(RAGPipeline):
         }
 
 
+def _config_digest(config: Dict[str, Any]) -> bytes:
+    """128-bit digest of a pipeline config, independent of key order"""
+    encoded = json.dumps(config, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
 def create_rag_pipeline(endpoint: Optional[str] = None, pipeline_type: str = "api") -> RAGPipeline:
     """
     Factory function to create RAG pipeline instances.
@@ -119,7 +195,7 @@ def create_rag_pipeline(endpoint: Optional[str] = None, pipeline_type: str = "ap
     elif pipeline_type == "api":
         if not endpoint:
             raise ValueError("Endpoint required for API pipeline")
-        return APIRAGPipeline(endpoint)
+        return APIRAGPipeline(endpoint, client=_http_client)
     else:
         raise ValueError(f"Unknown pipeline type: {pipeline_type}")
 
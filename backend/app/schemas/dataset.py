@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 from typing import Optional, List, Any, Dict
 from datetime import datetime
 
@@ -7,7 +7,12 @@ class DatasetItemCreate(BaseModel):
     query: str = Field(..., description="The query/question")
     ground_truth_docs: Optional[List[Any]] = Field(None, description="Ground truth documents")
     ground_truth_answer: Optional[str] = Field(None, description="Expected answer")
-    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+    # Read from DatasetItem.item_metadata on ORM objects, "metadata" in request payloads
+    metadata: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Additional metadata",
+        validation_alias=AliasChoices("item_metadata", "metadata")
+    )
 
 
 class DatasetItemResponse(DatasetItemCreate):
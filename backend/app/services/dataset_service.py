@@ -1,38 +1,76 @@
-from typing import List, Optional
-from sqlalchemy import select
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..db.models import Dataset, DatasetItem
-from ..schemas.dataset import DatasetCreate, DatasetResponse, DatasetWithItems
+from ..db.models import Dataset, DatasetItem, DatasetVersion, DatasetVersionItem
+from ..db.bulk import bulk_insert
+from ..schemas.dataset import DatasetCreate, DatasetItemCreate, DatasetResponse, DatasetWithItems
 from ..core.logging import log
+from ..core.config import settings
+from ..evaluation.retrieval import build_ground_truth_index
 from . import version_service
 
 
 async def create_dataset(db: AsyncSession, dataset_data: DatasetCreate) -> Dataset:
-    log.info(f"Creating dataset: {dataset_data.name}")
-    
-    dataset = Dataset(
+    return await create_dataset_from_stream(
+        db,
         name=dataset_data.name,
         description=dataset_data.description,
-        total_items=len(dataset_data.items),
         file_format=dataset_data.file_format,
+        items=_iterate(dataset_data.items)
+    )
+
+
+async def create_dataset_from_stream(
+    db: AsyncSession,
+    name: str,
+    description: Optional[str],
+    file_format: Optional[str],
+    items: AsyncIterable[DatasetItemCreate]
+) -> Dataset:
+    """
+    Create a dataset from an async stream of items.
+    
+    Items are bulk-inserted in batches of MAX_BATCH_SIZE so large uploads never
+    have to be held in memory at once; on PostgreSQL the batches are written
+    with COPY. Nothing is committed if the stream fails.
+    """
+    log.info(f"Creating dataset: {name}")
+    
+    dataset = Dataset(
+        name=name,
+        description=description,
+        total_items=0,
+        file_format=file_format,
         current_version=1
     )
     
     db.add(dataset)
     await db.flush()
     
-    for item_data in dataset_data.items:
-        item = DatasetItem(
-            dataset_id=dataset.id,
-            query=item_data.query,
-            ground_truth_docs=item_data.ground_truth_docs,
-            ground_truth_answer=item_data.ground_truth_answer,
-            metadata=item_data.metadata
-        )
-        db.add(item)
+    total_items = 0
+    batch = []
+    async for item_data in items:
+        batch.append({
+            "dataset_id": dataset.id,
+            "query": item_data.query,
+            "ground_truth_docs": item_data.ground_truth_docs,
+            "ground_truth_index": build_ground_truth_index(item_data.ground_truth_docs),
+            "ground_truth_answer": item_data.ground_truth_answer,
+            "item_metadata": item_data.metadata
+        })
+        
+        if len(batch) >= settings.MAX_BATCH_SIZE:
+            await bulk_insert(db, DatasetItem, batch)
+            total_items += len(batch)
+            batch = []
+    
+    if batch:
+        await bulk_insert(db, DatasetItem, batch)
+        total_items += len(batch)
+    
+    dataset.total_items = total_items
     
     await db.commit()
-    await db.refresh(dataset)
     
     await version_service.create_version(db, dataset.id, "Initial version")
     
@@ -40,6 +78,11 @@ async def create_dataset(db: AsyncSession, dataset_data: DatasetCreate) -> Datas
     return dataset
 
 
+async def _iterate(items: Iterable[DatasetItemCreate]) -> AsyncIterator[DatasetItemCreate]:
+    for item in items:
+        yield item
+
+
 async def get_dataset(db: AsyncSession, dataset_id: str) -> Optional[Dataset]:
     result = await db.execute(
         select(Dataset).where(Dataset.id == dataset_id)
@@ -58,11 +101,13 @@ async def get_dataset_with_items(db: AsyncSession, dataset_id: str) -> Optional[
     return result.scalar_one_or_none()
 
 
-async def list_datasets(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Dataset]:
+async def list_datasets(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[DatasetResponse]:
+    # Select only the listed columns and skip ORM instances and re-validation
+    columns = [getattr(Dataset, name) for name in DatasetResponse.model_fields]
     result = await db.execute(
-        select(Dataset).offset(skip).limit(limit).order_by(Dataset.created_at.desc())
+        select(*columns).offset(skip).limit(limit).order_by(Dataset.created_at.desc())
     )
-    return list(result.scalars().all())
+    return [DatasetResponse.model_construct(**row._mapping) for row in result]
 
 
 async def delete_dataset(db: AsyncSession, dataset_id: str) -> bool:
@@ -70,6 +115,14 @@ async def delete_dataset(db: AsyncSession, dataset_id: str) -> bool:
     if not dataset:
         return False
     
+    # Version items aren't mapped as a relationship, remove them in one statement
+    await db.execute(
+        delete(DatasetVersionItem).where(
+            DatasetVersionItem.version_id.in_(
+                select(DatasetVersion.id).where(DatasetVersion.dataset_id == dataset_id)
+            )
+        )
+    )
     await db.delete(dataset)
     await db.commit()
     
@@ -1,18 +1,25 @@
 """
 Evaluation service for managing evaluation runs
 """
-from typing import List, Optional, Dict, Any
-from sqlalchemy import select
+import asyncio
+from itertools import islice
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy import Row, delete, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from datetime import datetime
 from ..db.models import EvaluationRun, EvaluationResult, DatasetItem, RunStatus
-from ..schemas.evaluation import EvaluationRunCreate
-from ..evaluation.runner import EvaluationRunner, load_embedding_model
+from ..db.bulk import bulk_insert
+from ..schemas.evaluation import EvaluationRunCreate, EvaluationRunResponse
+from ..evaluation.runner import EvaluationRunner, MetricsAggregator, load_embedding_model
 from ..rag.pipelines import create_rag_pipeline
 from ..core.logging import log
 from ..core.config import settings
 
+# Columns read to build an EvaluationRunResponse directly from a row
+_RUN_RESPONSE_COLUMNS = [getattr(EvaluationRun, name) for name in EvaluationRunResponse.model_fields]
+
 
 async def create_evaluation_run(
     db: AsyncSession,
@@ -49,7 +56,6 @@ async def create_evaluation_run(
     
     db.add(run)
     await db.commit()
-    await db.refresh(run)
     
     log.info(f"Evaluation run created with ID: {run.id}")
     return run
@@ -72,13 +78,7 @@ async def execute_evaluation_run(
     """
     log.info(f"Executing evaluation run: {run_id}")
     
-    # Get run with dataset items
-    result = await db.execute(
-        select(EvaluationRun)
-        .options(selectinload(EvaluationRun.dataset).selectinload('items'))
-        .where(EvaluationRun.id == run_id)
-    )
-    run = result.scalar_one_or_none()
+    run = await get_evaluation_run(db, run_id)
     
     if not run:
         raise ValueError(f"Run not found: {run_id}")
@@ -86,14 +86,32 @@ async def execute_evaluation_run(
     if run.status == RunStatus.RUNNING:
         raise ValueError("Run is already running")
     
+    # The dataset items, only the columns the evaluation reads
+    result = await db.execute(
+        select(
+            DatasetItem.id,
+            DatasetItem.query,
+            DatasetItem.ground_truth_docs,
+            DatasetItem.ground_truth_answer,
+            DatasetItem.ground_truth_index
+        ).where(DatasetItem.dataset_id == run.dataset_id)
+    )
+    items = result.all()
+    
+    # Clear results left behind by an interrupted earlier attempt
+    await db.execute(delete(EvaluationResult).where(EvaluationResult.run_id == run.id))
+    run.completed_items = 0
+    
     # Update status
     run.status = RunStatus.RUNNING
     run.started_at = datetime.utcnow()
     await db.commit()
     
+    rag_pipeline = None
+    in_flight = set()
     try:
         # Initialize evaluation components
-        embedding_model = load_embedding_model()
+        embedding_model = await asyncio.to_thread(load_embedding_model)
         evaluator = EvaluationRunner(
             embedding_model=embedding_model,
             openai_api_key=settings.OPENAI_API_KEY
@@ -106,30 +124,30 @@ async def execute_evaluation_run(
             log.warning("No RAG endpoint provided, using mock pipeline")
             rag_pipeline = create_rag_pipeline(pipeline_type="mock")
         
-        # Process each dataset item
-        all_results = []
+        # Aggregated as result batches are written, so the run doesn't keep them all
+        aggregator = MetricsAggregator()
+        pending_results = []
         
-        for item in run.dataset.items:
-            log.info(f"Evaluating item {run.completed_items + 1}/{run.total_items}")
+        # Evaluate items concurrently, the RAG requests dominate the run time.
+        # At most EVAL_ITEM_CONCURRENCY tasks exist at once and each is dropped
+        # once consumed, so finished responses aren't held until the run ends
+        remaining = enumerate(items)
+        while True:
+            for position, item in islice(remaining, settings.EVAL_ITEM_CONCURRENCY - len(in_flight)):
+                in_flight.add(asyncio.ensure_future(
+                    _evaluate_item(position, item, rag_pipeline, evaluator, run.rag_config)
+                ))
+            if not in_flight:
+                break
             
-            try:
-                # Query RAG pipeline
-                rag_response = await rag_pipeline.query(
-                    item.query,
-                    run.rag_config
-                )
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item, rag_response, eval_result = task.result()
+                if eval_result is None:
+                    continue
                 
-                # Evaluate
-                eval_result = evaluator.evaluate_single(
-                    query=item.query,
-                    retrieved_docs=rag_response["retrieved_docs"],
-                    generated_answer=rag_response["generated_answer"],
-                    ground_truth_docs=item.ground_truth_docs,
-                    ground_truth_answer=item.ground_truth_answer
-                )
-                
-                # Store result
-                result_record = EvaluationResult(
+                # Buffer the result, results are written in batches
+                pending_results.append(dict(
                     run_id=run.id,
                     dataset_item_id=item.id,
                     retrieved_docs=rag_response["retrieved_docs"],
@@ -150,23 +168,23 @@ async def execute_evaluation_run(
                     hallucinated_spans=eval_result.get("hallucinated_spans"),
                     citation_coverage=eval_result.get("citation_coverage"),
                     metrics_detail=eval_result
-                )
+                ))
                 
-                db.add(result_record)
-                all_results.append(eval_result)
-                
-                # Update progress
+                # Update progress, committed with each result batch and every
+                # PROGRESS_COMMIT_INTERVAL items rather than per item
                 run.completed_items += 1
-                await db.commit()
                 
-            except Exception as e:
-                log.error(f"Error evaluating item {item.id}: {e}")
-                # Continue with next item
-                continue
+                if len(pending_results) >= settings.RESULT_FLUSH_SIZE:
+                    await _flush_results(db, run, aggregator, pending_results)
+                    await db.commit()
+                    pending_results = []
+                elif run.completed_items % settings.PROGRESS_COMMIT_INTERVAL == 0:
+                    await db.commit()
+            
+        await _flush_results(db, run, aggregator, pending_results)
         
         # Calculate aggregate metrics
-        aggregate_metrics = evaluator.calculate_aggregate_metrics(all_results)
-        run.metrics = aggregate_metrics
+        run.metrics = aggregator.finalize()
         
         # Mark as completed
         run.status = RunStatus.COMPLETED
@@ -175,17 +193,146 @@ async def execute_evaluation_run(
         
         log.info(f"Evaluation run completed: {run_id}")
         
+    except asyncio.CancelledError:
+        # Interrupted by shutdown, back to pending so it runs again on restart
+        log.warning(f"Evaluation run interrupted: {run_id}")
+        await db.rollback()
+        run.status = RunStatus.PENDING
+        await db.commit()
+        raise
     except Exception as e:
         log.error(f"Error executing evaluation run: {e}")
         run.status = RunStatus.FAILED
         run.error_message = str(e)
         await db.commit()
         raise
+    finally:
+        # Stop items still in flight when the run fails
+        for task in in_flight:
+            task.cancel()
+        if rag_pipeline is not None:
+            await rag_pipeline.aclose()
     
-    await db.refresh(run)
     return run
 
 
+async def _write_results(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Insert a batch of result rows with one bulk insert.
+    
+    If the batch is rejected by a constraint, the rows are retried one by
+    one so a single bad row only drops its own result.
+    
+    Returns:
+        The rows that were inserted
+    """
+    if not rows:
+        return rows
+    
+    try:
+        async with db.begin_nested():
+            await bulk_insert(db, EvaluationResult, rows)
+        return rows
+    except IntegrityError as e:
+        log.warning(f"Result batch rejected, inserting row by row: {e}")
+    
+    written = []
+    for row in rows:
+        try:
+            async with db.begin_nested():
+                await bulk_insert(db, EvaluationResult, [row])
+            written.append(row)
+        except IntegrityError as e:
+            log.error(f"Dropping result for item {row['dataset_item_id']}: {e}")
+    return written
+
+
+async def _flush_results(
+    db: AsyncSession,
+    run: EvaluationRun,
+    aggregator: MetricsAggregator,
+    rows: List[Dict[str, Any]]
+) -> None:
+    """
+    Write buffered result rows and aggregate the ones that were stored.
+    
+    Rows dropped by the write are taken back out of the run's progress, so
+    completed_items and the run metrics only cover persisted results.
+    """
+    written = await _write_results(db, rows)
+    run.completed_items -= len(rows) - len(written)
+    for row in written:
+        aggregator.update(row["metrics_detail"])
+
+
+async def _evaluate_item(
+    position: int,
+    item: Row,
+    rag_pipeline,
+    evaluator: EvaluationRunner,
+    rag_config: Optional[Dict[str, Any]]
+) -> Tuple[Row, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Query the RAG pipeline for one dataset item and evaluate the response.
+    
+    Returns:
+        The item with the RAG response and the evaluation result, both None
+        if the item failed
+    """
+    log.info(f"Evaluating item {position + 1}")
+    
+    try:
+        # Query RAG pipeline
+        rag_response = await rag_pipeline.query(item.query, rag_config)
+        
+        # Evaluate
+        eval_result = await evaluator.evaluate_single_async(
+            query=item.query,
+            retrieved_docs=rag_response["retrieved_docs"],
+            generated_answer=rag_response["generated_answer"],
+            ground_truth_docs=item.ground_truth_docs,
+            ground_truth_answer=item.ground_truth_answer,
+            ground_truth_index=item.ground_truth_index
+        )
+    except Exception as e:
+        log.error(f"Error evaluating item {item.id}: {e}")
+        return item, None, None
+    
+    return item, rag_response, eval_result
+
+
+async def mark_run_failed(db: AsyncSession, run: EvaluationRun, message: str) -> EvaluationRun:
+    """Mark a run as failed without executing it"""
+    run.status = RunStatus.FAILED
+    run.error_message = message
+    await db.commit()
+    return run
+
+
+async def recover_unfinished_runs(db: AsyncSession) -> List[str]:
+    """
+    Prepare runs left unfinished by a previous process for re-execution.
+    
+    Runs still marked RUNNING were interrupted and are reset to PENDING.
+    
+    Returns:
+        IDs of all PENDING runs, oldest first
+    """
+    await db.execute(
+        update(EvaluationRun)
+        .where(EvaluationRun.status == RunStatus.RUNNING)
+        .values(status=RunStatus.PENDING)
+    )
+    await db.commit()
+    
+    result = await db.execute(
+        select(EvaluationRun.id)
+        .where(EvaluationRun.status == RunStatus.PENDING)
+        .order_by(EvaluationRun.created_at)
+    )
+    return list(result.scalars())
+
+
 async def get_evaluation_run(db: AsyncSession, run_id: str) -> Optional[EvaluationRun]:
     """Get an evaluation run by ID"""
     result = await db.execute(
@@ -194,6 +341,15 @@ async def get_evaluation_run(db: AsyncSession, run_id: str) -> Optional[Evaluati
     return result.scalar_one_or_none()
 
 
+async def get_evaluation_run_response(db: AsyncSession, run_id: str) -> Optional[EvaluationRunResponse]:
+    """Get an evaluation run for display (only the response columns, without an ORM object)"""
+    result = await db.execute(
+        select(*_RUN_RESPONSE_COLUMNS).where(EvaluationRun.id == run_id)
+    )
+    row = result.first()
+    return EvaluationRunResponse.model_construct(**row._mapping) if row else None
+
+
 async def get_run_with_results(db: AsyncSession, run_id: str) -> Optional[EvaluationRun]:
     """Get evaluation run with all results"""
     result = await db.execute(
@@ -209,15 +365,15 @@ async def list_evaluation_runs(
     dataset_id: Optional[str] = None,
     skip: int = 0,
     limit: int = 100
-) -> List[EvaluationRun]:
-    """List evaluation runs"""
-    query = select(EvaluationRun).offset(skip).limit(limit).order_by(EvaluationRun.created_at.desc())
+) -> List[EvaluationRunResponse]:
+    """List evaluation runs (only the listed columns, without loading ORM objects)"""
+    query = select(*_RUN_RESPONSE_COLUMNS).offset(skip).limit(limit).order_by(EvaluationRun.created_at.desc())
     
     if dataset_id:
         query = query.where(EvaluationRun.dataset_id == dataset_id)
     
     result = await db.execute(query)
-    return list(result.scalars().all())
+    return [EvaluationRunResponse.model_construct(**row._mapping) for row in result]
 
 
 async def compare_runs(
@@ -236,8 +392,13 @@ async def compare_runs(
     Returns:
         Comparison data
     """
-    run1 = await get_evaluation_run(db, run_id_1)
-    run2 = await get_evaluation_run(db, run_id_2)
+    # Both runs in one round trip
+    result = await db.execute(
+        select(EvaluationRun).where(EvaluationRun.id.in_([run_id_1, run_id_2]))
+    )
+    runs = {run.id: run for run in result.scalars()}
+    run1 = runs.get(run_id_1)
+    run2 = runs.get(run_id_2)
     
     if not run1 or not run2:
         raise ValueError("One or both runs not found")
@@ -252,14 +413,17 @@ async def compare_runs(
     deltas = {}
     improvements = {}
     
-    for key in metrics1.keys():
-        if key in metrics2 and isinstance(metrics1[key], (int, float)):
-            delta = metrics2[key] - metrics1[key]
-            deltas[key] = round(delta, 4)
-            
-            if metrics1[key] != 0:
-                improvement_pct = (delta / abs(metrics1[key])) * 100
-                improvements[key] = round(improvement_pct, 2)
+    for key, before in metrics1.items():
+        after = metrics2.get(key)
+        if after is None or not isinstance(before, (int, float)):
+            continue
+        
+        delta = after - before
+        deltas[key] = round(delta, 4)
+        
+        if before != 0:
+            improvement_pct = (delta / abs(before)) * 100
+            improvements[key] = round(improvement_pct, 2)
     
     return {
         "run1": run1,
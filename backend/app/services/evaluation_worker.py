@@ -0,0 +1,85 @@
+"""
+Background worker pool for evaluation runs
+
+Runs are queued by ID and executed by a fixed number of workers, which bounds
+how many evaluations (and their DB sessions and embedding calls) run at once.
+The queue lives in memory, so runs still pending or running when the process
+stopped are queued again on startup.
+"""
+import asyncio
+from typing import List, Optional
+
+from ..db.session import AsyncSessionLocal
+from ..core.config import settings
+from ..core.logging import log
+from . import evaluation_service
+
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+
+
+async def start_workers() -> None:
+    """Create the run queue, spawn the worker tasks and queue unfinished runs"""
+    global _queue
+
+    # Collected before any request can queue a new run, so none is queued twice
+    async with AsyncSessionLocal() as db:
+        run_ids = await evaluation_service.recover_unfinished_runs(db)
+
+    _queue = asyncio.Queue(maxsize=settings.EVAL_QUEUE_SIZE)
+    for worker_id in range(settings.EVAL_WORKER_CONCURRENCY):
+        _workers.append(asyncio.create_task(_run_worker(worker_id)))
+
+    if run_ids:
+        log.info(f"Re-queueing {len(run_ids)} unfinished evaluation runs")
+        _workers.append(asyncio.create_task(_requeue_runs(run_ids)))
+
+    log.info(f"Started {settings.EVAL_WORKER_CONCURRENCY} evaluation workers")
+
+
+async def stop_workers() -> None:
+    """Cancel the worker tasks and wait for them to exit"""
+    for task in _workers:
+        task.cancel()
+
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+def is_full() -> bool:
+    """Whether the run queue is at capacity"""
+    return _queue is not None and _queue.full()
+
+
+def enqueue_run(run_id: str) -> None:
+    """
+    Queue a run for execution.
+
+    Raises:
+        asyncio.QueueFull: If the queue is at capacity
+    """
+    if _queue is None:
+        raise RuntimeError("Evaluation workers are not running")
+
+    _queue.put_nowait(run_id)
+
+
+async def _requeue_runs(run_ids: List[str]) -> None:
+    """Queue recovered runs, waiting for room when there are more than the queue holds"""
+    for run_id in run_ids:
+        await _queue.put(run_id)
+
+
+async def _run_worker(worker_id: int) -> None:
+    """Execute queued runs one at a time, each with its own DB session"""
+    while True:
+        run_id = await _queue.get()
+        log.debug(f"Worker {worker_id} picked up run {run_id}")
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await evaluation_service.execute_evaluation_run(db, run_id)
+        except Exception as e:
+            log.error(f"Background execution failed for run {run_id}: {e}")
+        finally:
+            _queue.task_done()
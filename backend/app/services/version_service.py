@@ -1,11 +1,19 @@
+import hashlib
+import json
 from typing import List, Optional, Dict, Any
-from sqlalchemy import select
+from sqlalchemy import and_, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from ..db.models import Dataset, DatasetItem, DatasetVersion
-from ..schemas.version import DatasetVersionCreate
+from sqlalchemy.orm import aliased, selectinload
+from ..db.models import Dataset, DatasetItem, DatasetVersion, DatasetVersionItem
+from ..db.bulk import bulk_insert
+from ..schemas.version import DatasetVersionCreate, DatasetVersionResponse
 from ..core.logging import log
-import json
+from ..core.config import settings
+from ..core.serialization import json_dumps
+from ..evaluation.retrieval import build_ground_truth_index
+
+# Columns read to build a DatasetVersionResponse directly from a row
+_VERSION_RESPONSE_COLUMNS = [getattr(DatasetVersion, name) for name in DatasetVersionResponse.model_fields]
 
 
 async def create_version(
@@ -15,38 +23,55 @@ async def create_version(
 ) -> DatasetVersion:
     log.info(f"Creating version for dataset: {dataset_id}")
     
-    result = await db.execute(
-        select(Dataset)
-        .options(selectinload(Dataset.items))
-        .where(Dataset.id == dataset_id)
-    )
-    dataset = result.scalar_one_or_none()
+    dataset = await db.get(Dataset, dataset_id)
     
     if not dataset:
         raise ValueError(f"Dataset not found: {dataset_id}")
     
-    items_snapshot = [
-        {
-            "id": item.id,
-            "query": item.query,
-            "ground_truth_docs": item.ground_truth_docs,
-            "ground_truth_answer": item.ground_truth_answer,
-            "metadata": item.metadata
-        }
-        for item in dataset.items
-    ]
-    
     version = DatasetVersion(
         dataset_id=dataset_id,
         version_number=dataset.current_version,
-        changes_summary=changes_summary,
-        item_count=len(dataset.items),
-        items_snapshot=items_snapshot
+        changes_summary=changes_summary
     )
-    
     db.add(version)
+    await db.flush()
+    
+    # Copy the items straight from their columns, streamed in partitions so
+    # neither ORM objects nor the whole dataset are held in memory
+    result = await db.stream(
+        select(
+            DatasetItem.id,
+            DatasetItem.query,
+            DatasetItem.ground_truth_docs,
+            DatasetItem.ground_truth_answer,
+            DatasetItem.item_metadata.label("metadata")
+        )
+        .where(DatasetItem.dataset_id == dataset_id)
+        .execution_options(yield_per=settings.MAX_BATCH_SIZE)
+    )
+    
+    item_count = 0
+    size_bytes = 0
+    async for partition in result.mappings().partitions():
+        version_items = []
+        for row in partition:
+            content = dict(row)
+            size_bytes += len(json_dumps(content))
+            version_items.append({
+                "version_id": version.id,
+                "item_id": content["id"],
+                "position": item_count,
+                "content_hash": _content_hash(content),
+                "content": content
+            })
+            item_count += 1
+        
+        await bulk_insert(db, DatasetVersionItem, version_items)
+    
+    version.item_count = item_count
+    version.snapshot_size_bytes = size_bytes
+    
     await db.commit()
-    await db.refresh(version)
     
     log.info(f"Version {version.version_number} created for dataset {dataset_id}")
     return version
@@ -70,8 +95,7 @@ async def get_version(
     version_number: int
 ) -> Optional[DatasetVersion]:
     result = await db.execute(
-        select(DatasetVersion)
-        .where(
+        select(DatasetVersion).where(
             DatasetVersion.dataset_id == dataset_id,
             DatasetVersion.version_number == version_number
         )
@@ -79,6 +103,22 @@ async def get_version(
     return result.scalar_one_or_none()
 
 
+async def get_version_response(
+    db: AsyncSession,
+    dataset_id: str,
+    version_number: int
+) -> Optional[DatasetVersionResponse]:
+    """Get a version for display (only the response columns, without an ORM object)"""
+    result = await db.execute(
+        select(*_VERSION_RESPONSE_COLUMNS).where(
+            DatasetVersion.dataset_id == dataset_id,
+            DatasetVersion.version_number == version_number
+        )
+    )
+    row = result.first()
+    return DatasetVersionResponse.model_construct(**row._mapping) if row else None
+
+
 async def rollback_to_version(
     db: AsyncSession,
     dataset_id: str,
@@ -90,6 +130,8 @@ async def rollback_to_version(
     if not version:
         raise ValueError(f"Version {version_number} not found")
     
+    items_data = await _version_contents(db, version)
+    
     result = await db.execute(
         select(Dataset)
         .options(selectinload(Dataset.items))
@@ -103,18 +145,22 @@ async def rollback_to_version(
     for item in dataset.items:
         await db.delete(item)
     
-    for item_data in version.items_snapshot:
-        new_item = DatasetItem(
-            dataset_id=dataset_id,
-            query=item_data["query"],
-            ground_truth_docs=item_data.get("ground_truth_docs"),
-            ground_truth_answer=item_data.get("ground_truth_answer"),
-            metadata=item_data.get("metadata")
-        )
-        db.add(new_item)
+    await bulk_insert(db, DatasetItem, [
+        {
+            "dataset_id": dataset_id,
+            "query": item_data["query"],
+            "ground_truth_docs": item_data.get("ground_truth_docs"),
+            "ground_truth_index": build_ground_truth_index(item_data.get("ground_truth_docs")),
+            "ground_truth_answer": item_data.get("ground_truth_answer"),
+            "item_metadata": item_data.get("metadata")
+        }
+        for item_data in items_data
+    ])
+    # Restored rows bypass the ORM, don't keep the stale collection loaded
+    db.expire(dataset, ["items"])
     
     dataset.current_version += 1
-    dataset.total_items = len(version.items_snapshot)
+    dataset.total_items = len(items_data)
     
     await create_version(
         db,
@@ -123,7 +169,6 @@ async def rollback_to_version(
     )
     
     await db.commit()
-    await db.refresh(dataset)
     
     log.info(f"Rollback completed for dataset {dataset_id}")
     return dataset
@@ -135,22 +180,32 @@ async def compare_versions(
     version1: int,
     version2: int
 ) -> Dict[str, Any]:
-    v1 = await get_version(db, dataset_id, version1)
-    v2 = await get_version(db, dataset_id, version2)
+    # Both versions in one round trip
+    result = await db.execute(
+        select(DatasetVersion).where(
+            DatasetVersion.dataset_id == dataset_id,
+            DatasetVersion.version_number.in_([version1, version2])
+        )
+    )
+    versions = {version.version_number: version for version in result.scalars()}
+    v1 = versions.get(version1)
+    v2 = versions.get(version2)
     
     if not v1 or not v2:
         raise ValueError("One or both versions not found")
     
-    items1 = {item["id"]: item for item in v1.items_snapshot}
-    items2 = {item["id"]: item for item in v2.items_snapshot}
-    
-    added = len(set(items2.keys()) - set(items1.keys()))
-    removed = len(set(items1.keys()) - set(items2.keys()))
-    
-    modified = 0
-    for item_id in set(items1.keys()) & set(items2.keys()):
-        if items1[item_id] != items2[item_id]:
-            modified += 1
+    # Join the two versions' items on id in the database
+    old = aliased(DatasetVersionItem)
+    new = aliased(DatasetVersionItem)
+    result = await db.execute(
+        select(func.count(), func.count(case((old.content_hash != new.content_hash, 1))))
+        .select_from(old)
+        .join(new, and_(new.version_id == v2.id, new.item_id == old.item_id))
+        .where(old.version_id == v1.id)
+    )
+    common, modified = result.one()
+    added = v2.item_count - common
+    removed = v1.item_count - common
     
     return {
         "version1": v1,
@@ -161,3 +216,18 @@ async def compare_versions(
         "total_changes": added + removed + modified
     }
 
+
+async def _version_contents(db: AsyncSession, version: DatasetVersion) -> List[Dict[str, Any]]:
+    """The items of a version in their original order"""
+    result = await db.execute(
+        select(DatasetVersionItem.content)
+        .where(DatasetVersionItem.version_id == version.id)
+        .order_by(DatasetVersionItem.position)
+    )
+    return list(result.scalars())
+
+
+def _content_hash(item: Dict[str, Any]) -> str:
+    """64-bit digest of a version item, independent of key order"""
+    encoded = json.dumps(item, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()